@@ -1,11 +1,56 @@
 import asyncio
 import logging
+import re
 from typing import Dict, Any, Optional, List
 from contextlib import asynccontextmanager
 
 from playwright.async_api import async_playwright, Browser, BrowserContext, Page
 from urllib.parse import urlparse
 
+# Long-lived Chromium shared by scans so each one only pays for a new context
+_shared_playwright = None
+_shared_browser: Optional[Browser] = None
+_shared_browser_lock = asyncio.Lock()
+
+async def get_shared_browser() -> Browser:
+    """
+    Get the process-wide headless browser, launching it on first use.
+    
+    Returns:
+        Browser: Connected Chromium instance
+    """
+    global _shared_playwright, _shared_browser
+    async with _shared_browser_lock:
+        if _shared_browser is None or not _shared_browser.is_connected():
+            if _shared_playwright is None:
+                _shared_playwright = await async_playwright().start()
+            _shared_browser = await _shared_playwright.chromium.launch(
+                headless=True,
+                # /dev/shm is tiny in containers; use /tmp for shared memory
+                args=['--disable-dev-shm-usage']
+            )
+            logging.getLogger(__name__).info("Shared browser launched")
+        return _shared_browser
+
+async def close_shared_browser():
+    """
+    Close the shared browser and stop its Playwright driver.
+    """
+    global _shared_playwright, _shared_browser
+    async with _shared_browser_lock:
+        if _shared_browser is not None:
+            try:
+                await _shared_browser.close()
+            except Exception as e:
+                logging.getLogger(__name__).error(f"Error closing shared browser: {e}")
+            _shared_browser = None
+        if _shared_playwright is not None:
+            try:
+                await _shared_playwright.stop()
+            except Exception as e:
+                logging.getLogger(__name__).error(f"Error stopping shared Playwright: {e}")
+            _shared_playwright = None
+
 class BrowserManager:
     """
     Manages Playwright browser lifecycle for website analysis and order button detection.
@@ -14,10 +59,29 @@ class BrowserManager:
     and comprehensive website analysis capabilities with proper resource cleanup.
     """
     
+    MOBILE_USER_AGENT = "Mozilla/5.0 (iPhone; CPU iPhone OS 16_6 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/16.6 Mobile/15E148 Safari/604.1"
+    
+    THIRD_PARTY_PLATFORMS = [
+        'doordash', 'ubereats', 'grubhub',
+        'postmates', 'seamless', 'chownow'
+    ]
+    
+    # Case-insensitive scans, so large HTML strings aren't lowercased per keyword
+    PLATFORM_PATTERN = re.compile('|'.join(THIRD_PARTY_PLATFORMS), re.IGNORECASE)
+    NAV_PATTERN = re.compile(r'<nav|<header|navigation', re.IGNORECASE)
+    ORDER_PATTERN = re.compile('order', re.IGNORECASE)
+    
+    # Resources skipped when blocking is enabled; stylesheets stay because
+    # innerText (used by order detection) leaves out CSS-hidden elements
+    BLOCKED_RESOURCE_TYPES = {'image', 'media', 'font'}
+    
     def __init__(self,
                  headless: bool = True,
                  viewport: Dict[str, int] = {"width": 375, "height": 667},
-                 timeout: int = 30000):
+                 timeout: int = 30000,
+                 use_shared_browser: bool = False,
+                 block_resources: bool = False,
+                 user_data_dir: Optional[str] = None):
         """
         Initialize BrowserManager with configurable settings.
         
@@ -25,10 +89,21 @@ class BrowserManager:
             headless (bool): Run browser in headless mode. Defaults to True.
             viewport (Dict[str, int]): Mobile viewport size. Defaults to 375x667.
             timeout (int): Navigation and interaction timeout in milliseconds.
+            use_shared_browser (bool): Open a context on the long-lived shared
+                browser instead of launching one. Closing then only closes the
+                context. The shared browser is always headless.
+            block_resources (bool): Abort image, media and font requests so
+                pages load faster. Screenshots then lack those resources.
+            user_data_dir (Optional[str]): Run in a persistent profile stored in
+                this directory, so cookies, cache and consent choices carry
+                over between runs. Takes precedence over use_shared_browser.
         """
         self._headless = headless
         self._viewport = viewport
         self._timeout = timeout
+        self._use_shared_browser = use_shared_browser
+        self._block_resources = block_resources
+        self._user_data_dir = user_data_dir
         self._playwright = None
         self._browser = None
         self._context = None
@@ -38,22 +113,35 @@ class BrowserManager:
     async def __aenter__(self):
         """
         Async context manager entry point.
-        Initializes Playwright and launches browser.
+        Initializes Playwright and launches browser (or reuses the shared one).
         
         Returns:
             BrowserManager: Configured browser manager instance.
         """
         try:
             self._logger.info("Initializing Playwright browser...")
-            self._playwright = await async_playwright().start()
-            self._browser = await self._playwright.chromium.launch(
-                headless=self._headless,
-                timeout=self._timeout
-            )
-            self._context = await self._browser.new_context(
-                viewport=self._viewport,
-                user_agent="Mozilla/5.0 (iPhone; CPU iPhone OS 16_6 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/16.6 Mobile/15E148 Safari/604.1"
-            )
+            if self._user_data_dir:
+                # The persistent context owns its browser; closing it closes both
+                self._playwright = await async_playwright().start()
+                self._context = await self._playwright.chromium.launch_persistent_context(
+                    self._user_data_dir,
+                    headless=self._headless,
+                    timeout=self._timeout,
+                    viewport=self._viewport,
+                    user_agent=self.MOBILE_USER_AGENT
+                )
+                await self._configure_context(self._context)
+            else:
+                if self._use_shared_browser:
+                    browser = await get_shared_browser()
+                else:
+                    self._playwright = await async_playwright().start()
+                    self._browser = await self._playwright.chromium.launch(
+                        headless=self._headless,
+                        timeout=self._timeout
+                    )
+                    browser = self._browser
+                self._context = await self._new_context(browser)
             self._logger.info("Browser initialized successfully")
             return self
         except Exception as e:
@@ -76,6 +164,46 @@ class BrowserManager:
         await self.close()
         return False  # Don't suppress exceptions
 
+    async def _new_context(self, browser: Browser) -> BrowserContext:
+        """
+        Open a browser context with the mobile viewport and user agent.
+        
+        Args:
+            browser (Browser): Browser to open the context on.
+        
+        Returns:
+            BrowserContext: New context, with resource blocking if enabled.
+        """
+        context = await browser.new_context(
+            viewport=self._viewport,
+            user_agent=self.MOBILE_USER_AGENT
+        )
+        await self._configure_context(context)
+        return context
+
+    async def _configure_context(self, context: BrowserContext):
+        """
+        Apply per-context settings such as resource blocking.
+        
+        Args:
+            context (BrowserContext): Newly opened context.
+        """
+        if self._block_resources:
+            # One route on the context covers every page opened from it
+            await context.route('**/*', self._block_heavy_resources)
+
+    async def _block_heavy_resources(self, route):
+        """
+        Abort requests for resource types in BLOCKED_RESOURCE_TYPES.
+        
+        Args:
+            route: Playwright route for the intercepted request.
+        """
+        if route.request.resource_type in self.BLOCKED_RESOURCE_TYPES:
+            await route.abort()
+        else:
+            await route.continue_()
+
     @asynccontextmanager
     async def get_page(self):
         """
@@ -88,15 +216,24 @@ class BrowserManager:
                 # ... work with page ...
             # Page is automatically closed
         
+        Without an entered context, a manager using the shared browser opens
+        a fresh context for just this page, so concurrent callers stay isolated.
+        
         Yields:
             Page: Configured Playwright page that will be automatically closed.
         """
         page = None
+        page_context = None
         try:
-            if not self._context:
+            if self._context:
+                page = await self._context.new_page()
+            elif self._use_shared_browser:
+                browser = await get_shared_browser()
+                page_context = await self._new_context(browser)
+                page = await page_context.new_page()
+            else:
                 raise RuntimeError("Browser context not initialized. Use 'async with BrowserManager()' first.")
             
-            page = await self._context.new_page()
             page.set_default_timeout(self._timeout)
             self._active_pages.add(page)
             self._logger.debug(f"Created new page. Active pages: {len(self._active_pages)}")
@@ -112,6 +249,11 @@ class BrowserManager:
                     self._logger.debug(f"Closed page. Active pages: {len(self._active_pages)}")
                 except Exception as e:
                     self._logger.error(f"Error closing page: {e}")
+            if page_context:
+                try:
+                    await page_context.close()
+                except Exception as e:
+                    self._logger.error(f"Error closing page context: {e}")
 
     async def create_page(self) -> Page:
         """
@@ -237,11 +379,6 @@ class BrowserManager:
             'button[aria-label*="order"]', 'a[aria-label*="order"]',
             '[data-testid*="order"]', '[data-test*="order"]'
         ]
-        
-        third_party_platforms = [
-            'doordash', 'ubereats', 'grubhub',
-            'postmates', 'seamless', 'chownow'
-        ]
 
         results = {
             "order_button_detected": False,
@@ -277,7 +414,7 @@ class BrowserManager:
                                 
                                 # Verify it's not in navigation (common false positive)
                                 parent_html = await button.evaluate('el => el.parentElement?.outerHTML || ""')
-                                is_nav = any(tag in parent_html.lower() for tag in ['<nav', '<header', 'navigation'])
+                                is_nav = self.NAV_PATTERN.search(parent_html) is not None
                                 
                                 if not is_nav and len(button_text) < 100:  # Reasonable button text length
                                     results["order_button_detected"] = True
@@ -298,7 +435,7 @@ class BrowserManager:
                     for button in buttons:
                         button_text = await button.inner_text()
                         # Must contain "order" in the text to be valid
-                        if button_text and 'order' in button_text.lower():
+                        if button_text and self.ORDER_PATTERN.search(button_text):
                             results["order_button_detected"] = True
                             results["button_text"] = button_text.strip()
                             results["button_selector"] = selector
@@ -309,9 +446,10 @@ class BrowserManager:
 
             # Detect third-party platforms
             page_text = await page.content()
+            found = {match.lower() for match in self.PLATFORM_PATTERN.findall(page_text)}
             results["platforms"] = [
-                platform for platform in third_party_platforms
-                if platform in page_text.lower()
+                platform for platform in self.THIRD_PARTY_PLATFORMS
+                if platform in found
             ]
 
         except Exception as e:
@@ -387,5 +525,8 @@ class BrowserManager:
         
         self._logger.info("Browser cleanup completed")
 
-# Global browser manager instance
-browser_manager = BrowserManager()
\ No newline at end of file
+# Global browser manager instance (pages open on the shared browser)
+browser_manager = BrowserManager(use_shared_browser=True)
+
+# Same, but images, media and fonts are aborted on every page's context
+blocking_browser_manager = BrowserManager(use_shared_browser=True, block_resources=True)
\ No newline at end of file
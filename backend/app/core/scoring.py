@@ -1,4 +1,5 @@
 from typing import Dict, Any, Optional
+import bisect
 import statistics
 from datetime import datetime, timedelta
 
@@ -7,6 +8,18 @@ class RestaurantScorer:
     Scoring class for restaurant-related metrics with weighted scoring algorithm.
     """
 
+    # Category weights for the overall score: 30/30/25/15
+    CATEGORY_WEIGHTS = (
+        ('website', 0.30),
+        ('google', 0.30),
+        ('reviews', 0.25),
+        ('ordering', 0.15)
+    )
+
+    # Lower bound of each grade above F; a score on a threshold earns the higher grade
+    GRADE_THRESHOLDS = (60, 70, 80, 90)
+    GRADE_LETTERS = 'FDCBA'
+
     @staticmethod
     def _clamp_score(score: float) -> float:
         """
@@ -20,6 +33,19 @@ class RestaurantScorer:
         """
         return max(0.0, min(100.0, score))
 
+    @classmethod
+    def letter_grade(cls, score: float) -> str:
+        """
+        Map an overall score to its letter grade.
+        
+        Args:
+            score (float): Overall score (0-100)
+        
+        Returns:
+            str: Letter grade A-F
+        """
+        return cls.GRADE_LETTERS[bisect.bisect_right(cls.GRADE_THRESHOLDS, score)]
+
     def calculate_website_score(self, website_data: dict) -> float:
         """
         Calculate website quality score incorporating PageSpeed metrics.
@@ -189,44 +215,46 @@ class RestaurantScorer:
             dict: Overall score details
         """
         # Default to 0 if category not present
-        website_score = scores.get('website', 0)
-        google_score = scores.get('google', 0)
-        reviews_score = scores.get('reviews', 0)
-        ordering_score = scores.get('ordering', 0)
+        category_scores = {
+            category: scores.get(category, 0) for category, _ in self.CATEGORY_WEIGHTS
+        }
 
-        # Apply weights: 30/30/25/15
+        # Apply weights: 30/30/25/15 (four multiplications; cheaper to redo than to memoize)
         weighted_scores = {
-            'website': website_score * 0.30,
-            'google': google_score * 0.30,
-            'reviews': reviews_score * 0.25,
-            'ordering': ordering_score * 0.15
+            category: category_scores[category] * weight
+            for category, weight in self.CATEGORY_WEIGHTS
         }
 
         # Calculate overall score
         overall_score = sum(weighted_scores.values())
 
         # Determine letter grade
-        if overall_score >= 90:
-            letter_grade = 'A'
-        elif overall_score >= 80:
-            letter_grade = 'B'
-        elif overall_score >= 70:
-            letter_grade = 'C'
-        elif overall_score >= 60:
-            letter_grade = 'D'
-        else:
-            letter_grade = 'F'
+        letter_grade = self.letter_grade(overall_score)
 
         return {
             'overall_score': round(overall_score, 2),
             'letter_grade': letter_grade,
             'category_scores': {
-                'website': round(website_score, 2),
-                'google': round(google_score, 2),
-                'reviews': round(reviews_score, 2),
-                'ordering': round(ordering_score, 2)
+                key: round(value, 2) for key, value in category_scores.items()
             },
             'weighted_scores': {
                 key: round(value, 2) for key, value in weighted_scores.items()
             }
-        }
\ No newline at end of file
+        }
+
+    def score_restaurant(self, data: dict) -> dict:
+        """
+        Score every category from raw analysis data and combine them in one call.
+        
+        Args:
+            data (dict): Raw 'website', 'google', 'reviews' and 'ordering' analysis data
+        
+        Returns:
+            dict: Overall score details, as returned by calculate_overall_score
+        """
+        return self.calculate_overall_score({
+            'website': self.calculate_website_score(data.get('website')),
+            'google': self.calculate_google_score(data.get('google')),
+            'reviews': self.calculate_reviews_score(data.get('reviews')),
+            'ordering': self.calculate_ordering_score(data.get('ordering'))
+        })
@@ -8,7 +8,10 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 
 from .config import settings
+from .core.browser import close_shared_browser, get_shared_browser
 from .database import database
+from .utils.cache import close_redis_client
+from .utils.http_client import close_http_client
 # from .celery_app import celery_app
 
 # Configure logging
@@ -23,14 +26,21 @@ async def lifespan(app: FastAPI):
     """
     Manage application startup and shutdown events.
     
-    - Connect to MongoDB on startup
-    - Close MongoDB connection on shutdown
+    - Connect to MongoDB and preload the shared browser on startup
+    - Close MongoDB connection, shared browser and HTTP/Redis clients on shutdown
     """
     try:
         # Connect to database on startup
         await database.connect()
         logger.info("Database connection established")
         
+        # Launch Chromium once so scans don't pay the cold start
+        try:
+            await get_shared_browser()
+        except Exception as e:
+            # Not fatal - scans retry the launch on first use
+            logger.warning(f"Browser preload failed: {e}")
+        
         yield
         
     except Exception as e:
@@ -40,6 +50,13 @@ async def lifespan(app: FastAPI):
         # Ensure database connection is closed
         await database.close()
         logger.info("Database connection closed")
+        
+        # Release pooled outbound HTTP and Redis connections
+        await close_http_client()
+        await close_redis_client()
+        
+        # Shut down the shared browser
+        await close_shared_browser()
 
 # Create FastAPI application with lifespan management
 app = FastAPI(
@@ -118,5 +135,6 @@ if __name__ == "__main__":
         "main:app", 
         host="0.0.0.0", 
         port=8000, 
-        reload=settings.ENVIRONMENT == "development"
+        reload=settings.ENVIRONMENT == "development",
+        loop="auto"  # Picks uvloop when installed
     )
\ No newline at end of file
@@ -24,21 +24,15 @@ async def search_restaurants(
         List[RestaurantSearchResult]: List of matching restaurants
     """
     try:
-        # Perform search using multiple sources
-        google_results = await RestaurantSearchService.search_google_places(
-            query, 
-            location, 
-            radius
-        )
-        
-        overpass_results = await RestaurantSearchService.search_overpass(
+        # Search all sources concurrently
+        results = await RestaurantSearchService.search_all(
             query, 
             location, 
             radius
         )
         
         # Combine and deduplicate results
-        combined_results = _deduplicate_results(google_results + overpass_results)
+        combined_results = _deduplicate_results(results)
         
         return combined_results
     
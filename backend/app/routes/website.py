@@ -243,59 +243,55 @@ async def analyze_website(request: WebsiteAnalyzeRequest):
         
         # Perform website analysis using existing analyzer
         try:
-            # Import browser_manager singleton
-            from ..core.browser import browser_manager
+            # Use WebsiteAnalyzer to get comprehensive analysis
+            # (pages come from the shared browser, no per-request launch)
+            analysis_results = await WebsiteAnalyzer.analyze_website(request.url)
+            
+            # Check if analysis returned empty or failed results
+            if not analysis_results or len(analysis_results) == 0:
+                logger.error(f"Analysis returned empty results for {request.url}")
+                raise Exception("Website analysis returned no data. The website may be unreachable or blocking automated access.")
+            
+            # Calculate website score using existing scorer
+            scorer = RestaurantScorer()
+            
+            # Prepare data for scoring
+            website_data = {
+                'pagespeed_score': analysis_results.get('performance_score', 0),
+                'is_mobile_friendly': analysis_results.get('mobile_friendly', False),
+                'has_online_ordering': analysis_results.get('online_ordering_links_count', 0) > 0,
+                'has_ssl': analysis_results.get('https_enabled', False)
+            }
+            
+            website_score = scorer.calculate_website_score(website_data)
+            
+            # Generate recommendations
+            recommendations = generate_recommendations(analysis_results)
+            
+            # Update scan with results
+            update_data = {
+                "status": "completed",
+                "website_score": website_score,
+                "analysis_data": analysis_results,
+                "recommendations": recommendations,
+                "completed_at": datetime.utcnow(),
+                "upgraded_to_full_scan": False
+            }
+            
+            await update_scan(scan_id, update_data)
+            
+            logger.info(f"Website analysis completed for {request.url} - Score: {website_score:.1f}")
+            
+            return WebsiteAnalyzeResponse(
+                scan_id=scan_id,
+                url=request.url,
+                website_score=website_score,
+                status="completed",
+                analysis_data=analysis_results,
+                recommendations=[WebsiteRecommendation(**rec) for rec in recommendations],
+                created_at=scan_data["created_at"]
+            )
             
-            # Initialize browser manager and perform analysis
-            async with browser_manager:
-                # Use WebsiteAnalyzer to get comprehensive analysis
-                analysis_results = await WebsiteAnalyzer.analyze_website(request.url)
-                
-                # Check if analysis returned empty or failed results
-                if not analysis_results or len(analysis_results) == 0:
-                    logger.error(f"Analysis returned empty results for {request.url}")
-                    raise Exception("Website analysis returned no data. The website may be unreachable or blocking automated access.")
-                
-                # Calculate website score using existing scorer
-                scorer = RestaurantScorer()
-                
-                # Prepare data for scoring
-                website_data = {
-                    'pagespeed_score': analysis_results.get('performance_score', 0),
-                    'is_mobile_friendly': analysis_results.get('mobile_friendly', False),
-                    'has_online_ordering': analysis_results.get('online_ordering_links_count', 0) > 0,
-                    'has_ssl': analysis_results.get('https_enabled', False)
-                }
-                
-                website_score = scorer.calculate_website_score(website_data)
-                
-                # Generate recommendations
-                recommendations = generate_recommendations(analysis_results)
-                
-                # Update scan with results
-                update_data = {
-                    "status": "completed",
-                    "website_score": website_score,
-                    "analysis_data": analysis_results,
-                    "recommendations": recommendations,
-                    "completed_at": datetime.utcnow(),
-                    "upgraded_to_full_scan": False
-                }
-                
-                await update_scan(scan_id, update_data)
-                
-                logger.info(f"Website analysis completed for {request.url} - Score: {website_score:.1f}")
-                
-                return WebsiteAnalyzeResponse(
-                    scan_id=scan_id,
-                    url=request.url,
-                    website_score=website_score,
-                    status="completed",
-                    analysis_data=analysis_results,
-                    recommendations=[WebsiteRecommendation(**rec) for rec in recommendations],
-                    created_at=scan_data["created_at"]
-                )
-                
         except HTTPException:
             # Re-raise HTTP exceptions
             raise
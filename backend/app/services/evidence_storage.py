@@ -1,29 +1,66 @@
+import asyncio
+import functools
 import logging
-import uuid
+import secrets
 from typing import Dict, Any, Optional, List, Union
 import boto3
 from botocore.exceptions import ClientError
 
 from ..config import settings
 
+@functools.lru_cache(maxsize=1)
+def _get_r2_client():
+    """
+    Create the Cloudflare R2 client once and share it across service instances.
+    
+    Building a boto3 client is expensive, and botocore clients are thread-safe.
+    
+    Returns:
+        S3 client configured for the R2 endpoint
+    """
+    return boto3.client(
+        's3',
+        endpoint_url=f'https://{settings.R2_ACCOUNT_ID}.r2.cloudflarestorage.com',
+        aws_access_key_id=settings.R2_ACCESS_KEY_ID,
+        aws_secret_access_key=settings.R2_SECRET_ACCESS_KEY,
+        region_name='auto'
+    )
+
 class EvidenceStorageService:
     """
     Service for storing and managing evidence files using Cloudflare R2 storage.
     Provides methods for uploading, retrieving, and managing evidence files.
     """
-    
+
+    # Maximum number of keys accepted by a single S3 delete_objects call
+    MAX_DELETE_BATCH = 1000
+
+    # Evidence type -> file extension
+    FILE_EXTENSIONS = {
+        'screenshot': 'png',
+        'report': 'pdf',
+        'log': 'txt',
+        'html': 'html',
+        'json': 'json'
+    }
+
+    # File extension -> MIME type
+    MIME_TYPES = {
+        'png': 'image/png',
+        'pdf': 'application/pdf',
+        'txt': 'text/plain',
+        'html': 'text/html',
+        'json': 'application/json'
+    }
+
     def __init__(self):
         """
-        Initialize Cloudflare R2 client using boto3 with specific configuration.
+        Initialize the service with the shared Cloudflare R2 client.
         """
-        self.s3_client = boto3.client(
-            's3',
-            endpoint_url=f'https://{settings.R2_ACCOUNT_ID}.r2.cloudflarestorage.com',
-            aws_access_key_id=settings.R2_ACCESS_KEY_ID,
-            aws_secret_access_key=settings.R2_SECRET_ACCESS_KEY,
-            region_name='auto'
-        )
+        self.s3_client = _get_r2_client()
         self.bucket_name = settings.R2_BUCKET_NAME
+        # Public URLs share one prefix; build it once instead of per object
+        self._public_base_url = f"https://{self.bucket_name}.r2.cloudflarestorage.com/"
     
     async def upload_evidence(
         self, 
@@ -47,7 +84,7 @@ class EvidenceStorageService:
         try:
             # Generate unique filename
             file_extension = self._get_file_extension(file_type)
-            filename = f"{scan_id}/{file_type}_{uuid.uuid4()}.{file_extension}"
+            filename = f"{scan_id}/{file_type}_{secrets.token_hex(16)}.{file_extension}"
             
             # Convert string to bytes if needed
             if isinstance(file_content, str):
@@ -146,7 +183,84 @@ class EvidenceStorageService:
                 "error": str(e),
                 "filename": filename
             }
-    
+
+    async def delete_scan_evidence(
+        self,
+        scan_id: str
+    ) -> Dict[str, Any]:
+        """
+        Delete all evidence files for a scan using bulk delete requests.
+
+        Args:
+            scan_id (str): Scan ID to delete evidence for
+
+        Returns:
+            Dict[str, Any]: Deletion result with number of deleted files
+        """
+        # boto3 calls block; run the listing and deletes off the event loop
+        return await asyncio.to_thread(self._delete_scan_evidence_sync, scan_id)
+
+    def _delete_scan_evidence_sync(
+        self,
+        scan_id: str
+    ) -> Dict[str, Any]:
+        """
+        List and bulk-delete a scan's evidence files (blocking).
+
+        Args:
+            scan_id (str): Scan ID to delete evidence for
+
+        Returns:
+            Dict[str, Any]: Deletion result with number of deleted files
+        """
+        deleted_count = 0
+        errors = []
+
+        try:
+            # Page through every key under the scan; each page holds at most
+            # 1000 keys, which is also the delete_objects limit
+            paginator = self.s3_client.get_paginator('list_objects_v2')
+            pages = paginator.paginate(
+                Bucket=self.bucket_name,
+                Prefix=f"{scan_id}/",
+                PaginationConfig={'PageSize': self.MAX_DELETE_BATCH}
+            )
+
+            for page in pages:
+                batch = [obj['Key'] for obj in page.get('Contents', [])]
+                if not batch:
+                    continue
+
+                response = self.s3_client.delete_objects(
+                    Bucket=self.bucket_name,
+                    Delete={
+                        'Objects': [{'Key': filename} for filename in batch],
+                        'Quiet': True
+                    }
+                )
+
+                # Quiet mode only reports keys that failed to delete
+                batch_errors = response.get('Errors', [])
+                errors.extend(error.get('Key') for error in batch_errors)
+                deleted_count += len(batch) - len(batch_errors)
+
+            return {
+                "success": not errors,
+                "scan_id": scan_id,
+                "deleted_count": deleted_count,
+                "failed": errors
+            }
+
+        except ClientError as e:
+            # Listing failures land here too, so nothing is reported as deleted
+            logging.error(f"R2 delete scan evidence error: {e}")
+            return {
+                "success": False,
+                "error": str(e),
+                "scan_id": scan_id,
+                "deleted_count": deleted_count
+            }
+
     def _generate_public_url(self, filename: str) -> str:
         """
         Generate a public URL for the stored file.
@@ -157,10 +271,10 @@ class EvidenceStorageService:
         Returns:
             str: Public URL for the file
         """
-        return f"https://{self.bucket_name}.r2.cloudflarestorage.com/{filename}"
+        return self._public_base_url + filename
     
-    @staticmethod
-    def _get_file_extension(file_type: str) -> str:
+    @classmethod
+    def _get_file_extension(cls, file_type: str) -> str:
         """
         Determine file extension based on file type.
         
@@ -170,18 +284,10 @@ class EvidenceStorageService:
         Returns:
             str: Appropriate file extension
         """
-        extension_map = {
-            'screenshot': 'png',
-            'report': 'pdf',
-            'log': 'txt',
-            'html': 'html',
-            'json': 'json'
-        }
-        
-        return extension_map.get(file_type.lower(), 'txt')
+        return cls.FILE_EXTENSIONS.get(file_type.lower(), 'txt')
     
-    @staticmethod
-    def _get_mime_type(extension: str) -> str:
+    @classmethod
+    def _get_mime_type(cls, extension: str) -> str:
         """
         Get MIME type for a given file extension.
         
@@ -191,15 +297,7 @@ class EvidenceStorageService:
         Returns:
             str: Corresponding MIME type
         """
-        mime_types = {
-            'png': 'image/png',
-            'pdf': 'application/pdf',
-            'txt': 'text/plain',
-            'html': 'text/html',
-            'json': 'application/json'
-        }
-        
-        return mime_types.get(extension.lower(), 'application/octet-stream')
+        return cls.MIME_TYPES.get(extension.lower(), 'application/octet-stream')
     
     async def store_scan_evidence(
         self, 
@@ -1,9 +1,11 @@
-import httpx
+import heapq
 import logging
+import orjson
 from typing import Dict, Any, Optional, List
 from urllib.parse import quote_plus
 
 from ..config import settings
+from ..utils.http_client import GOOGLE_PLACES_SEMAPHORE, get_http_client, request_with_retry
 from ..models.restaurant import RestaurantCreate, GeoLocation
 
 class GoogleBusinessAnalyzer:
@@ -37,38 +39,43 @@ class GoogleBusinessAnalyzer:
                 return {}
             
             # Then get detailed information
-            async with httpx.AsyncClient() as client:
-                params = {
-                    'place_id': place_id,
-                    'key': settings.GOOGLE_PLACES_API_KEY,
-                    'fields': ','.join([
-                        'name', 
-                        'rating', 
-                        'user_ratings_total', 
-                        'formatted_phone_number',
-                        'website', 
-                        'opening_hours', 
-                        'photos',
-                        'reviews'
-                    ])
-                }
-                
-                response = await client.get(cls.GOOGLE_PLACES_DETAILS_URL, params=params)
-                response.raise_for_status()
-                
-                data = response.json().get('result', {})
-                
-                return {
-                    'profile_exists': True,
-                    'name': data.get('name'),
-                    'rating': data.get('rating'),
-                    'review_count': data.get('user_ratings_total', 0),
-                    'phone': data.get('formatted_phone_number'),
-                    'website': data.get('website'),
-                    'photos_count': len(data.get('photos', [])),
-                    'is_open_now': cls._check_open_status(data.get('opening_hours', {})),
-                    'recent_reviews': cls._extract_recent_reviews(data.get('reviews', []))
-                }
+            client = get_http_client()
+            params = {
+                'place_id': place_id,
+                'key': settings.GOOGLE_PLACES_API_KEY,
+                'fields': ','.join([
+                    'name', 
+                    'rating', 
+                    'user_ratings_total', 
+                    'formatted_phone_number',
+                    'website', 
+                    'opening_hours', 
+                    'photos',
+                    'reviews'
+                ])
+            }
+            
+            response = await request_with_retry(
+                client, 
+                'GET', 
+                cls.GOOGLE_PLACES_DETAILS_URL, 
+                GOOGLE_PLACES_SEMAPHORE, 
+                params=params
+            )
+            
+            data = orjson.loads(response.content).get('result', {})
+            
+            return {
+                'profile_exists': True,
+                'name': data.get('name'),
+                'rating': data.get('rating'),
+                'review_count': data.get('user_ratings_total', 0),
+                'phone': data.get('formatted_phone_number'),
+                'website': data.get('website'),
+                'photos_count': len(data.get('photos', [])),
+                'is_open_now': cls._check_open_status(data.get('opening_hours', {})),
+                'recent_reviews': cls._extract_recent_reviews(data.get('reviews', []))
+            }
         
         except Exception as e:
             logging.error(f"Google Business Profile analysis error: {e}")
@@ -89,30 +96,36 @@ class GoogleBusinessAnalyzer:
             Optional[str]: Place ID if found
         """
         try:
-            async with httpx.AsyncClient() as client:
-                # Construct search query
-                query = f"{restaurant.name} {restaurant.address}"
-                
-                params = {
-                    'query': quote_plus(query),
-                    'key': settings.GOOGLE_PLACES_API_KEY
-                }
-                
-                # Add location if available
-                if restaurant.geo_location:
-                    params['location'] = (
-                        f"{restaurant.geo_location.latitude},"
-                        f"{restaurant.geo_location.longitude}"
-                    )
-                    params['radius'] = 5000  # 5 km search radius
-                
-                response = await client.get(cls.GOOGLE_PLACES_SEARCH_URL, params=params)
-                response.raise_for_status()
-                
-                results = response.json().get('results', [])
-                
-                # Return the first place_id if found
-                return results[0].get('place_id') if results else None
+            client = get_http_client()
+            
+            # Construct search query
+            query = f"{restaurant.name} {restaurant.address}"
+            
+            params = {
+                'query': quote_plus(query),
+                'key': settings.GOOGLE_PLACES_API_KEY
+            }
+            
+            # Add location if available
+            if restaurant.geo_location:
+                params['location'] = (
+                    f"{restaurant.geo_location.latitude},"
+                    f"{restaurant.geo_location.longitude}"
+                )
+                params['radius'] = 5000  # 5 km search radius
+            
+            response = await request_with_retry(
+                client, 
+                'GET', 
+                cls.GOOGLE_PLACES_SEARCH_URL, 
+                GOOGLE_PLACES_SEMAPHORE, 
+                params=params
+            )
+            
+            results = orjson.loads(response.content).get('results', [])
+            
+            # Return the first place_id if found
+            return results[0].get('place_id') if results else None
         
         except Exception as e:
             logging.error(f"Place ID search error: {e}")
@@ -150,11 +163,12 @@ class GoogleBusinessAnalyzer:
             List[Dict[str, Any]]: Processed recent reviews
         """
         try:
-            # Sort reviews by time (most recent first)
-            sorted_reviews = sorted(
-                reviews, 
-                key=lambda r: r.get('time', 0), 
-                reverse=True
+            # Select the most recent reviews without sorting the full list
+            # (a missing or null time sorts as oldest)
+            recent_reviews = heapq.nlargest(
+                limit,
+                reviews,
+                key=lambda r: r.get('time') or 0
             )
             
             # Extract key review information
@@ -164,7 +178,7 @@ class GoogleBusinessAnalyzer:
                     'text': review.get('text', ''),
                     'time': review.get('time')
                 }
-                for review in sorted_reviews[:limit]
+                for review in recent_reviews
             ]
         
         except Exception as e:
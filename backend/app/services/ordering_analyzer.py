@@ -1,4 +1,5 @@
 import logging
+import re
 from typing import List, Dict, Any, Optional
 import httpx
 from urllib.parse import urlparse
@@ -83,20 +84,17 @@ class OrderingAnalyzer:
                 
                 # Look for ordering-related links
                 ordering_links = await page.evaluate('''() => {
-                    const links = Array.from(document.querySelectorAll('a'));
-                    const orderingKeywords = [
-                        'order', 'delivery', 'takeout', 'online menu', 
-                        'reserve', 'book table', 'catering'
-                    ];
+                    const keywordRe = /order|delivery|takeout|online menu|reserve|book table|catering/i;
+                    const matches = [];
                     
-                    return links
-                        .filter(link => 
-                            orderingKeywords.some(keyword => 
-                                link.textContent.toLowerCase().includes(keyword) ||
-                                link.href.toLowerCase().includes(keyword)
-                            )
-                        )
-                        .map(link => link.href);
+                    // Single pass over the browser-maintained links collection
+                    for (const link of document.links) {
+                        const href = link.href;
+                        if (keywordRe.test(href) || keywordRe.test(link.textContent)) {
+                            matches.push(href);
+                        }
+                    }
+                    return matches;
                 }''')
                 
                 return ordering_links
@@ -124,18 +122,18 @@ class OrderingAnalyzer:
                 await page.goto(website_url, timeout=15000)
                 
                 # Look for third-party platform links
-                platform_links = await page.evaluate(f'''() => {{
-                    const links = Array.from(document.querySelectorAll('a'));
-                    const platforms = {cls.ORDERING_PLATFORMS};
+                platform_links = await page.evaluate('''(platformPattern) => {
+                    const platformRe = new RegExp(platformPattern, 'i');
+                    const matches = [];
                     
-                    return links
-                        .filter(link => 
-                            platforms.some(platform => 
-                                link.href.toLowerCase().includes(platform)
-                            )
-                        )
-                        .map(link => link.href);
-                }}''')
+                    // Single pass over the browser-maintained links collection
+                    for (const link of document.links) {
+                        if (platformRe.test(link.href)) {
+                            matches.push(link.href);
+                        }
+                    }
+                    return matches;
+                }''', '|'.join(re.escape(platform) for platform in cls.ORDERING_PLATFORMS))
                 
                 return platform_links
         
@@ -1,9 +1,19 @@
-import httpx
+import asyncio
+import ijson
 import logging
+import orjson
+import re
 from typing import List, Dict, Any, Optional
 from urllib.parse import quote_plus
 
 from ..config import settings
+from ..utils.http_client import (
+    GOOGLE_PLACES_SEMAPHORE,
+    OVERPASS_SEMAPHORE,
+    get_http_client,
+    request_with_retry,
+    with_retry
+)
 from ..models.restaurant import RestaurantCreate, RestaurantCategory, GeoLocation
 
 class RestaurantSearchService:
@@ -16,6 +26,73 @@ class RestaurantSearchService:
     GOOGLE_PLACES_BASE_URL = "https://maps.googleapis.com/maps/api/place/textsearch/json"
     OVERPASS_BASE_URL = "https://overpass-api.de/api/interpreter"
     
+    # Google Places type -> category, checked in this (priority) order
+    GOOGLE_TYPE_MAPPING = {
+        'fast_food': RestaurantCategory.FAST_FOOD,
+        'cafe': RestaurantCategory.CAFE,
+        'bar': RestaurantCategory.BISTRO,
+        'pizza': RestaurantCategory.PIZZA,
+        'sushi': RestaurantCategory.SUSHI,
+        'steakhouse': RestaurantCategory.STEAKHOUSE,
+        'vegetarian': RestaurantCategory.VEGETARIAN,
+        'vegan': RestaurantCategory.VEGAN
+    }
+    
+    # Characters with special meaning in Overpass (POSIX extended) regexes
+    OVERPASS_REGEX_SPECIAL = re.compile(r'([.^$*+?()\[\]{}|\\])')
+    
+    # OpenStreetMap cuisine -> category, checked in this (priority) order
+    OSM_CUISINE_MAPPING = {
+        'fast_food': RestaurantCategory.FAST_FOOD,
+        'pizza': RestaurantCategory.PIZZA,
+        'sushi': RestaurantCategory.SUSHI,
+        'steak': RestaurantCategory.STEAKHOUSE,
+        'vegetarian': RestaurantCategory.VEGETARIAN,
+        'vegan': RestaurantCategory.VEGAN,
+        'cafe': RestaurantCategory.CAFE
+    }
+    
+    @classmethod
+    async def search_all(
+        cls, 
+        query: str, 
+        location: Optional[GeoLocation] = None, 
+        radius: int = 5000
+    ) -> List[RestaurantCreate]:
+        """
+        Search Google Places and Overpass concurrently and merge the results.
+        
+        Args:
+            query (str): Search query
+            location (Optional[GeoLocation]): Geographical location to center search
+            radius (int): Search radius in meters
+        
+        Returns:
+            List[RestaurantCreate]: Combined restaurants, deduplicated by name and position
+        """
+        results = await asyncio.gather(
+            cls.search_google_places(query, location, radius),
+            cls.search_overpass(query, location, radius),
+            return_exceptions=True
+        )
+        
+        merged = {}
+        for source_results in results:
+            if isinstance(source_results, Exception):
+                logging.error(f"Restaurant search source error: {source_results}")
+                continue
+            
+            for restaurant in source_results:
+                # Rounded coordinates (~11m) identify the same place across sources
+                geo = restaurant.geo_location
+                if geo:
+                    key = (restaurant.name.lower(), round(geo.latitude, 4), round(geo.longitude, 4))
+                else:
+                    key = (restaurant.name.lower(), restaurant.address.lower())
+                merged.setdefault(key, restaurant)
+        
+        return list(merged.values())
+    
     @classmethod
     async def search_google_places(
         cls, 
@@ -35,43 +112,48 @@ class RestaurantSearchService:
             List[RestaurantCreate]: List of found restaurants
         """
         try:
-            async with httpx.AsyncClient() as client:
-                params = {
-                    'query': quote_plus(query),
-                    'key': settings.GOOGLE_PLACES_API_KEY,
-                    'type': 'restaurant'
-                }
-                
-                # Add location if provided
-                if location:
-                    params['location'] = f"{location.latitude},{location.longitude}"
-                    params['radius'] = radius
-                
-                response = await client.get(cls.GOOGLE_PLACES_BASE_URL, params=params)
-                response.raise_for_status()
-                
-                data = response.json()
-                restaurants = []
-                
-                for result in data.get('results', []):
-                    try:
-                        restaurant = RestaurantCreate(
-                            name=result.get('name', ''),
-                            address=result.get('formatted_address', ''),
-                            category=cls._map_google_type(result.get('types', [])),
-                            geo_location=GeoLocation(
-                                latitude=result.get('geometry', {}).get('location', {}).get('lat', 0),
-                                longitude=result.get('geometry', {}).get('location', {}).get('lng', 0)
-                            ),
-                            contact_info={
-                                'phone': result.get('international_phone_number')
-                            }
-                        )
-                        restaurants.append(restaurant)
-                    except Exception as e:
-                        logging.warning(f"Could not parse restaurant: {e}")
-                
-                return restaurants
+            client = get_http_client()
+            params = {
+                'query': quote_plus(query),
+                'key': settings.GOOGLE_PLACES_API_KEY,
+                'type': 'restaurant'
+            }
+            
+            # Add location if provided
+            if location:
+                params['location'] = f"{location.latitude},{location.longitude}"
+                params['radius'] = radius
+            
+            response = await request_with_retry(
+                client, 
+                'GET', 
+                cls.GOOGLE_PLACES_BASE_URL, 
+                GOOGLE_PLACES_SEMAPHORE, 
+                params=params
+            )
+            
+            data = orjson.loads(response.content)
+            restaurants = []
+            
+            for result in data.get('results', []):
+                try:
+                    restaurant = RestaurantCreate(
+                        name=result.get('name', ''),
+                        address=result.get('formatted_address', ''),
+                        category=cls._map_google_type(result.get('types', [])),
+                        geo_location=GeoLocation(
+                            latitude=result.get('geometry', {}).get('location', {}).get('lat', 0),
+                            longitude=result.get('geometry', {}).get('location', {}).get('lng', 0)
+                        ),
+                        contact_info={
+                            'phone': result.get('international_phone_number')
+                        }
+                    )
+                    restaurants.append(restaurant)
+                except Exception as e:
+                    logging.warning(f"Could not parse restaurant: {e}")
+            
+            return restaurants
         
         except Exception as e:
             logging.error(f"Google Places search error: {e}")
@@ -96,64 +178,121 @@ class RestaurantSearchService:
             List[RestaurantCreate]: List of found restaurants
         """
         try:
-            async with httpx.AsyncClient() as client:
-                # Construct Overpass QL query
-                if location:
-                    overpass_query = f"""
-                    [out:json][timeout:25];
-                    (
-                      node["amenity"="restaurant"]
-                        (around:{radius},{location.latitude},{location.longitude});
-                      way["amenity"="restaurant"]
-                        (around:{radius},{location.latitude},{location.longitude});
-                      relation["amenity"="restaurant"]
-                        (around:{radius},{location.latitude},{location.longitude});
-                    );
-                    out center;
-                    """
-                else:
-                    overpass_query = f"""
-                    [out:json][timeout:25];
-                    (
-                      node["amenity"="restaurant"]["name"~"{quote_plus(query)}",i];
-                      way["amenity"="restaurant"]["name"~"{quote_plus(query)}",i];
-                      relation["amenity"="restaurant"]["name"~"{quote_plus(query)}",i];
-                    );
-                    out center;
-                    """
-                
-                response = await client.post(
-                    cls.OVERPASS_BASE_URL, 
-                    data={'data': overpass_query}
-                )
-                response.raise_for_status()
-                
-                data = response.json()
+            client = get_http_client()
+            
+            # Construct Overpass QL query
+            if location:
+                overpass_query = f"""
+                [out:json][timeout:25];
+                (
+                  node["amenity"="restaurant"]
+                    (around:{radius},{location.latitude},{location.longitude});
+                  way["amenity"="restaurant"]
+                    (around:{radius},{location.latitude},{location.longitude});
+                  relation["amenity"="restaurant"]
+                    (around:{radius},{location.latitude},{location.longitude});
+                );
+                out center;
+                """
+            else:
+                name_pattern = cls._escape_overpass_regex(query)
+                overpass_query = f"""
+                [out:json][timeout:25];
+                (
+                  node["amenity"="restaurant"]["name"~"{name_pattern}",i];
+                  way["amenity"="restaurant"]["name"~"{name_pattern}",i];
+                  relation["amenity"="restaurant"]["name"~"{name_pattern}",i];
+                );
+                out center;
+                """
+            
+            async def fetch_restaurants() -> List[RestaurantCreate]:
                 restaurants = []
                 
-                for element in data.get('elements', []):
-                    try:
-                        restaurant = RestaurantCreate(
-                            name=element.get('tags', {}).get('name', ''),
-                            address=cls._build_overpass_address(element),
-                            category=cls._map_osm_type(element.get('tags', {})),
-                            geo_location=GeoLocation(
-                                latitude=element.get('lat', 0),
-                                longitude=element.get('lon', 0)
-                            )
-                        )
-                        restaurants.append(restaurant)
-                    except Exception as e:
-                        logging.warning(f"Could not parse Overpass restaurant: {e}")
+                # Stream the response and build restaurants element by element
+                # so large result sets are never held in memory all at once.
+                # Overpass accepts the raw query as the request body
+                async with client.stream(
+                    'POST',
+                    cls.OVERPASS_BASE_URL, 
+                    content=overpass_query.encode('utf-8'),
+                    headers={'Content-Type': 'text/plain; charset=utf-8'},
+                    timeout=30.0  # Query allows Overpass up to 25s server-side
+                ) as response:
+                    response.raise_for_status()
+                    
+                    elements = ijson.sendable_list()
+                    parser = ijson.items_coro(elements, 'elements.item', use_float=True)
+                    
+                    async for chunk in response.aiter_bytes():
+                        parser.send(chunk)
+                        restaurants.extend(cls._parse_overpass_elements(elements))
+                        del elements[:]
+                    
+                    parser.close()
+                    restaurants.extend(cls._parse_overpass_elements(elements))
                 
                 return restaurants
+            
+            # Retry the whole streamed request so partial reads are discarded
+            restaurants = await with_retry(fetch_restaurants, OVERPASS_SEMAPHORE)
+            
+            return restaurants
         
         except Exception as e:
             logging.error(f"Overpass search error: {e}")
             return []
     
-    @staticmethod
-    def _map_google_type(types: List[str]) -> RestaurantCategory:
+    @classmethod
+    def _escape_overpass_regex(cls, query: str) -> str:
+        """
+        Escape a search term for use inside an Overpass QL regex string.
+        
+        Args:
+            query (str): Raw search term
+        
+        Returns:
+            str: Term with regex metacharacters escaped and quoted for Overpass QL
+        """
+        # Escape POSIX regex metacharacters, then escape for the QL string literal
+        pattern = cls.OVERPASS_REGEX_SPECIAL.sub(r'\\\1', query.strip())
+        return pattern.replace('\\', '\\\\').replace('"', '\\"')
+    
+    @classmethod
+    def _parse_overpass_elements(
+        cls, 
+        elements: List[Dict[str, Any]]
+    ) -> List[RestaurantCreate]:
+        """
+        Convert Overpass API elements into restaurants.
+        
+        Args:
+            elements (List[Dict[str, Any]]): Overpass API elements
+        
+        Returns:
+            List[RestaurantCreate]: Parsed restaurants
+        """
+        restaurants = []
+        
+        for element in elements:
+            try:
+                restaurant = RestaurantCreate(
+                    name=element.get('tags', {}).get('name', ''),
+                    address=cls._build_overpass_address(element),
+                    category=cls._map_osm_type(element.get('tags', {})),
+                    geo_location=GeoLocation(
+                        latitude=element.get('lat', 0),
+                        longitude=element.get('lon', 0)
+                    )
+                )
+                restaurants.append(restaurant)
+            except Exception as e:
+                logging.warning(f"Could not parse Overpass restaurant: {e}")
+        
+        return restaurants
+    
+    @classmethod
+    def _map_google_type(cls, types: List[str]) -> RestaurantCategory:
         """
         Map Google Places types to RestaurantCategory.
         
@@ -163,25 +302,18 @@ class RestaurantSearchService:
         Returns:
             RestaurantCategory: Mapped restaurant category
         """
-        type_mapping = {
-            'fast_food': RestaurantCategory.FAST_FOOD,
-            'cafe': RestaurantCategory.CAFE,
-            'bar': RestaurantCategory.BISTRO,
-            'pizza': RestaurantCategory.PIZZA,
-            'sushi': RestaurantCategory.SUSHI,
-            'steakhouse': RestaurantCategory.STEAKHOUSE,
-            'vegetarian': RestaurantCategory.VEGETARIAN,
-            'vegan': RestaurantCategory.VEGAN
-        }
-        
-        for type_key, category in type_mapping.items():
-            if any(type_key in t.lower() for t in types):
+        lowered_types = {t.lower() for t in types}
+        
+        # Keys are checked in mapping order (it sets the priority); an exact type
+        # is a set hit, otherwise fall back to substrings (e.g. "sushi_restaurant")
+        for type_key, category in cls.GOOGLE_TYPE_MAPPING.items():
+            if type_key in lowered_types or any(type_key in t for t in lowered_types):
                 return category
         
         return RestaurantCategory.OTHER
     
-    @staticmethod
-    def _map_osm_type(tags: Dict[str, str]) -> RestaurantCategory:
+    @classmethod
+    def _map_osm_type(cls, tags: Dict[str, str]) -> RestaurantCategory:
         """
         Map OpenStreetMap tags to RestaurantCategory.
         
@@ -192,18 +324,13 @@ class RestaurantSearchService:
             RestaurantCategory: Mapped restaurant category
         """
         cuisine = tags.get('cuisine', '').lower()
-        type_mapping = {
-            'fast_food': RestaurantCategory.FAST_FOOD,
-            'pizza': RestaurantCategory.PIZZA,
-            'sushi': RestaurantCategory.SUSHI,
-            'steak': RestaurantCategory.STEAKHOUSE,
-            'vegetarian': RestaurantCategory.VEGETARIAN,
-            'vegan': RestaurantCategory.VEGAN,
-            'cafe': RestaurantCategory.CAFE
-        }
-        
-        for type_key, category in type_mapping.items():
-            if type_key in cuisine:
+        
+        # OSM cuisines are semicolon-separated. Keys are checked in mapping order
+        # (it sets the priority); an exact value is a set hit, otherwise fall back
+        # to substrings (e.g. "steak_house")
+        cuisine_values = {value.strip() for value in cuisine.split(';')}
+        for type_key, category in cls.OSM_CUISINE_MAPPING.items():
+            if type_key in cuisine_values or type_key in cuisine:
                 return category
         
         return RestaurantCategory.OTHER
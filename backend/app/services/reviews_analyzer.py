@@ -1,7 +1,36 @@
+import asyncio
+import functools
 import logging
+import multiprocessing
+import os
+import re
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 from typing import List, Dict, Any, Optional
 import httpx
-from textblob import TextBlob
+from textblob.en.sentiments import PatternAnalyzer
+
+@functools.lru_cache(maxsize=1)
+def _get_cpu_pool() -> ProcessPoolExecutor:
+    """
+    Create the process pool for CPU-bound review analysis on first use.
+    
+    Returns:
+        ProcessPoolExecutor: Pool with one worker per CPU core
+    """
+    return ProcessPoolExecutor(max_workers=os.cpu_count())
+
+def _batch_sentiment(texts: List[str]) -> List[float]:
+    """
+    Score a chunk of review texts inside a worker process.
+    
+    Args:
+        texts (List[str]): Review texts to analyze
+    
+    Returns:
+        List[float]: Sentiment scores, in input order
+    """
+    return ReviewsAnalyzer._analyze_sentiment_batch(texts)
 
 class ReviewsAnalyzer:
     """
@@ -9,6 +38,37 @@ class ReviewsAnalyzer:
     Provides sentiment analysis, theme extraction, and comprehensive review insights.
     """
     
+    # Batches smaller than this are scored inline; process startup would dominate
+    PARALLEL_SENTIMENT_MIN_REVIEWS = 100
+    
+    # Reviews sent to a worker process per task
+    SENTIMENT_CHUNK_SIZE = 50
+    
+    # Shared sentiment analyzer; TextBlob would build its analyzer per review
+    SENTIMENT_ANALYZER = PatternAnalyzer()
+    
+    # Potential themes and the keywords that signal them
+    THEME_KEYWORDS = {
+        'food_quality': ['taste', 'delicious', 'flavor', 'fresh', 'quality'],
+        'service': ['friendly', 'staff', 'service', 'wait', 'attentive'],
+        'atmosphere': ['ambiance', 'decor', 'environment', 'clean', 'nice'],
+        'price': ['expensive', 'cheap', 'value', 'affordable', 'cost'],
+        'location': ['parking', 'convenient', 'location', 'area', 'accessible']
+    }
+    
+    # Keyword -> theme lookup for regex matches
+    KEYWORD_THEMES = {
+        keyword: theme
+        for theme, keywords in THEME_KEYWORDS.items()
+        for keyword in keywords
+    }
+    
+    # All keywords in one alternation; the lookahead makes matches zero-width
+    # so overlapping keywords (e.g. "staffresh") are all seen, like `in` checks
+    THEME_PATTERN = re.compile(
+        '(?=(' + '|'.join(re.escape(keyword) for keyword in KEYWORD_THEMES) + '))'
+    )
+    
     @classmethod
     async def analyze_reviews(
         cls, 
@@ -30,25 +90,24 @@ class ReviewsAnalyzer:
             if total_reviews == 0:
                 return cls._empty_review_analysis()
             
+            # Extract ratings and texts once; helpers work on these columns
+            ratings = [review.get('rating', 0) for review in reviews]
+            texts = [review.get('text', '') or '' for review in reviews]
+            
             # Calculate average rating
-            average_rating = sum(
-                review.get('rating', 0) for review in reviews
-            ) / total_reviews
+            average_rating = sum(ratings) / total_reviews
             
-            # Sentiment analysis
-            sentiment_scores = [
-                cls._analyze_sentiment(review.get('text', '')) 
-                for review in reviews
-            ]
+            # Sentiment analysis for all reviews, off the event loop for large batches
+            sentiment_scores = await cls._analyze_sentiment_parallel(texts)
             
             # Calculate overall sentiment
             overall_sentiment = sum(sentiment_scores) / len(sentiment_scores)
             
             # Extract key themes
-            key_themes = cls._extract_themes(reviews)
+            key_themes = cls._extract_themes(texts)
             
             # Detailed rating distribution
-            rating_distribution = cls._calculate_rating_distribution(reviews)
+            rating_distribution = cls._calculate_rating_distribution(ratings)
             
             return {
                 'total_reviews': total_reviews,
@@ -63,8 +122,61 @@ class ReviewsAnalyzer:
             logging.error(f"Review analysis error: {e}")
             return cls._empty_review_analysis()
     
-    @staticmethod
-    def _analyze_sentiment(text: str) -> float:
+    @classmethod
+    async def _analyze_sentiment_parallel(cls, texts: List[str]) -> List[float]:
+        """
+        Score review texts across worker processes so the event loop stays free.
+        
+        Falls back to inline scoring for small batches, inside daemonic
+        processes (e.g. a Celery worker), or when the pool fails; a failed pool
+        is replaced on the next call.
+        
+        Args:
+            texts (List[str]): Review texts to analyze
+        
+        Returns:
+            List[float]: Sentiment scores between -1 and 1, in input order
+        """
+        # Daemonic processes (Celery prefork workers) can't start pool workers
+        if len(texts) < cls.PARALLEL_SENTIMENT_MIN_REVIEWS or multiprocessing.current_process().daemon:
+            return cls._analyze_sentiment_batch(texts)
+        
+        try:
+            loop = asyncio.get_running_loop()
+            pool = _get_cpu_pool()
+            chunks = [
+                texts[start:start + cls.SENTIMENT_CHUNK_SIZE]
+                for start in range(0, len(texts), cls.SENTIMENT_CHUNK_SIZE)
+            ]
+            results = await asyncio.gather(*(
+                loop.run_in_executor(pool, _batch_sentiment, chunk)
+                for chunk in chunks
+            ))
+            return [score for chunk_scores in results for score in chunk_scores]
+        
+        except Exception as e:
+            logging.warning(f"Parallel sentiment analysis unavailable, scoring inline: {e}")
+            # Drop the pool (e.g. a BrokenProcessPool) so the next call starts a fresh one
+            if _get_cpu_pool.cache_info().currsize:
+                _get_cpu_pool().shutdown(wait=False, cancel_futures=True)
+                _get_cpu_pool.cache_clear()
+            return cls._analyze_sentiment_batch(texts)
+    
+    @classmethod
+    def _analyze_sentiment_batch(cls, texts: List[str]) -> List[float]:
+        """
+        Perform sentiment analysis on a batch of review texts.
+        
+        Args:
+            texts (List[str]): Review texts to analyze
+        
+        Returns:
+            List[float]: Sentiment scores between -1 and 1, in input order
+        """
+        return [cls._analyze_sentiment(text) for text in texts]
+    
+    @classmethod
+    def _analyze_sentiment(cls, text: str) -> float:
         """
         Perform sentiment analysis on review text.
         
@@ -74,74 +186,60 @@ class ReviewsAnalyzer:
         Returns:
             float: Sentiment score between -1 (very negative) and 1 (very positive)
         """
+        # Empty reviews are neutral; skip the analyzer entirely
+        if not text or text.isspace():
+            return 0.0
+        
         try:
-            # Use TextBlob for sentiment analysis
-            blob = TextBlob(text.lower())
-            return blob.sentiment.polarity
+            # Use TextBlob's pattern analyzer for sentiment analysis
+            return cls.SENTIMENT_ANALYZER.analyze(text.lower()).polarity
         
         except Exception as e:
             logging.warning(f"Sentiment analysis error: {e}")
             return 0.0
     
-    @staticmethod
-    def _extract_themes(reviews: List[Dict[str, Any]]) -> List[str]:
+    @classmethod
+    def _extract_themes(cls, texts: List[str]) -> List[str]:
         """
         Extract key themes from reviews using basic NLP techniques.
         
         Args:
-            reviews (List[Dict[str, Any]]): List of reviews
+            texts (List[str]): Review texts
         
         Returns:
             List[str]: Extracted key themes
         """
         try:
-            # Combine all review texts
-            all_text = ' '.join(
-                review.get('text', '').lower() 
-                for review in reviews
-            )
+            # Scan review by review instead of joining one large string
+            found = set()
+            for text in texts:
+                for match in cls.THEME_PATTERN.finditer(text.lower()):
+                    found.add(cls.KEYWORD_THEMES[match.group(1)])
+                if len(found) == len(cls.THEME_KEYWORDS):
+                    break
             
-            # Define a list of potential themes
-            theme_keywords = {
-                'food_quality': ['taste', 'delicious', 'flavor', 'fresh', 'quality'],
-                'service': ['friendly', 'staff', 'service', 'wait', 'attentive'],
-                'atmosphere': ['ambiance', 'decor', 'environment', 'clean', 'nice'],
-                'price': ['expensive', 'cheap', 'value', 'affordable', 'cost'],
-                'location': ['parking', 'convenient', 'location', 'area', 'accessible']
-            }
-            
-            # Find themes
-            detected_themes = [
-                theme for theme, keywords in theme_keywords.items()
-                if any(keyword in all_text for keyword in keywords)
-            ]
-            
-            return detected_themes
+            # Keep the themes in their declared order
+            return [theme for theme in cls.THEME_KEYWORDS if theme in found]
         
         except Exception as e:
             logging.warning(f"Theme extraction error: {e}")
             return []
     
     @staticmethod
-    def _calculate_rating_distribution(reviews: List[Dict[str, Any]]) -> Dict[int, int]:
+    def _calculate_rating_distribution(ratings: List[int]) -> Dict[int, int]:
         """
         Calculate distribution of ratings.
         
         Args:
-            reviews (List[Dict[str, Any]]): List of reviews
+            ratings (List[int]): Review ratings
         
         Returns:
             Dict[int, int]: Rating distribution
         """
         try:
-            distribution = {1: 0, 2: 0, 3: 0, 4: 0, 5: 0}
-            
-            for review in reviews:
-                rating = review.get('rating', 0)
-                if 1 <= rating <= 5:
-                    distribution[rating] += 1
-            
-            return distribution
+            # Count in C, then keep only the 1-5 star buckets
+            counts = Counter(ratings)
+            return {star: counts.get(star, 0) for star in range(1, 6)}
         
         except Exception as e:
             logging.warning(f"Rating distribution error: {e}")
@@ -1,10 +1,17 @@
 import asyncio
+import logging
 from datetime import datetime
 from typing import Dict, Any
 from ..database import update_scan
 from ..core.browser import BrowserManager
 from ..core.scoring import RestaurantScorer
+from ..models.restaurant import RestaurantCreate
+from ..models.scan import ScanStatus, ScanInDB
 from ..utils.logger import logger
+from .website_analyzer import WebsiteAnalyzer
+from .google_analyzer import GoogleBusinessAnalyzer
+from .reviews_analyzer import ReviewsAnalyzer
+from .ordering_analyzer import OrderingAnalyzer
 
 async def run_restaurant_scan(scan_id: str, restaurant_data: dict):
     """
@@ -25,7 +32,8 @@ async def run_restaurant_scan(scan_id: str, restaurant_data: dict):
         website_data = {}
         if website_url:
             logger.info(f"Analyzing website: {website_url}")
-            async with BrowserManager() as browser:
+            # Reuse the preloaded browser; each scan gets its own context
+            async with BrowserManager(use_shared_browser=True) as browser:
                 website_data = await browser.analyze_website(website_url)
         
         # Mock other analyzers for now (Phase 5 will add real APIs)
@@ -45,26 +53,22 @@ async def run_restaurant_scan(scan_id: str, restaurant_data: dict):
             "positive_sentiment": 0.75
         }
         
+        # Derive ordering signals from the website's order button once
+        order_button = website_data.get("order_button", {})
+        order_button_found = order_button.get("found", False)
         ordering_data = {
-            "has_ordering": website_data.get("order_button", {}).get("found", False),
-            "platforms_count": len(website_data.get("order_button", {}).get("platforms", [])),
-            "has_direct_ordering": website_data.get("order_button", {}).get("found", False),
-            "order_button_found": website_data.get("order_button", {}).get("found", False)
+            "has_ordering": order_button_found,
+            "platforms_count": len(order_button.get("platforms", [])),
+            "has_direct_ordering": order_button_found,
+            "order_button_found": order_button_found
         }
         
         # Calculate scores
-        scorer = RestaurantScorer()
-        
-        website_score = scorer.calculate_website_score(website_data)
-        google_score = scorer.calculate_google_score(google_data)
-        reviews_score = scorer.calculate_reviews_score(reviews_data)
-        ordering_score = scorer.calculate_ordering_score(ordering_data)
-        
-        overall_scores = scorer.calculate_overall_score({
-            "website": website_score,
-            "google": google_score,
-            "reviews": reviews_score,
-            "ordering": ordering_score
+        overall_scores = RestaurantScorer().score_restaurant({
+            "website": website_data,
+            "google": google_data,
+            "reviews": reviews_data,
+            "ordering": ordering_data
         })
         
         # Update scan with results
@@ -93,17 +97,6 @@ async def run_restaurant_scan(scan_id: str, restaurant_data: dict):
         })
 
 # Legacy class-based orchestrator (kept for backward compatibility)
-import logging
-from typing import Dict, Any, Optional
-
-from ..models.restaurant import RestaurantCreate
-from ..models.scan import ScanStatus, ScanInDB
-from .restaurant_search import RestaurantSearchService
-from .website_analyzer import WebsiteAnalyzer
-from .google_analyzer import GoogleBusinessAnalyzer
-from .reviews_analyzer import ReviewsAnalyzer
-from .ordering_analyzer import OrderingAnalyzer
-
 class ScanOrchestrator:
     """
     Coordinates the entire restaurant scanning process.
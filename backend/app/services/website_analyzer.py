@@ -1,11 +1,16 @@
 import asyncio
+import copy
+import hashlib
 import httpx
 import logging
+import orjson
 from typing import Dict, Any, Optional
 from urllib.parse import urlparse
 
-from ..core.browser import browser_manager
+from ..core.browser import blocking_browser_manager
 from ..config import settings
+from ..utils.cache import TTLCache, get_redis_client
+from ..utils.http_client import PAGESPEED_SEMAPHORE, get_http_client, request_with_retry
 
 class WebsiteAnalyzer:
     """
@@ -15,11 +20,42 @@ class WebsiteAnalyzer:
     
     PAGESPEED_URL = "https://www.googleapis.com/pagespeedonline/v5/runPagespeed"
     
+    # Lighthouse audits take a while to respond, but connecting should not
+    PAGESPEED_TIMEOUT = httpx.Timeout(90.0, connect=5.0, pool=5.0)
+    
+    # Availability only needs the response headers
+    AVAILABILITY_TIMEOUT = httpx.Timeout(5.0, connect=3.0, pool=1.0)
+    
+    # Recent results keyed by normalized URL, so rescans skip PageSpeed and Playwright
+    _analysis_cache = TTLCache(maxsize=1024, ttl=30 * 60)
+    _availability_cache = TTLCache(maxsize=1024, ttl=5 * 60)
+    _playwright_cache = TTLCache(maxsize=1024, ttl=60)
+    
+    # ETag / Last-Modified validators per URL for conditional availability checks
+    _validators_cache = TTLCache(maxsize=1024, ttl=24 * 60 * 60)
+    
+    # PageSpeed results are shared across workers via Redis for a day
+    PAGESPEED_CACHE_TTL = 24 * 60 * 60
+    
+    # Running PageSpeed audits by cache key, so duplicates can await them
+    _pagespeed_inflight: Dict[str, asyncio.Future] = {}
+    
+    # Collect every page probe in one evaluate call (one CDP round-trip)
+    PAGE_PROBE_SCRIPT = """() => ({
+        bodyWidth: document.body.clientWidth,
+        hasContactForm: document.querySelector("form[name*=contact], input[type=email]") !== null,
+        orderingLinks: document.querySelectorAll('a[href*="order"], a[href*="delivery"]').length,
+        title: document.title,
+        metaDescription: document.querySelector("meta[name=description]")?.content ?? null
+    })"""
+    
     @classmethod
     async def analyze_website(
         cls, 
         url: str, 
-        mobile: bool = True
+        mobile: bool = True,
+        no_cache: bool = False,
+        include_playwright: bool = True
     ) -> Dict[str, Any]:
         """
         Perform comprehensive website analysis.
@@ -27,38 +63,79 @@ class WebsiteAnalyzer:
         Args:
             url (str): Website URL to analyze
             mobile (bool): Whether to analyze mobile or desktop version
+            no_cache (bool): Ignore cached results and re-measure (the fresh
+                results still refresh the cache)
+            include_playwright (bool): Run the browser analysis; pass False when
+                only PageSpeed scores are needed
         
         Returns:
-            Dict[str, Any]: Detailed website analysis results
+            Dict[str, Any]: Detailed website analysis results; PageSpeed scores
+                are left out if that call failed
+        
+        Raises:
+            Exception: If the browser analysis fails (e.g. a navigation timeout)
         """
-        # Validate and normalize URL
-        parsed_url = urlparse(url)
-        if not parsed_url.scheme:
+        # Validate and normalize URL (a prefix check avoids a full urlparse)
+        if not url[:8].lower().startswith(('http://', 'https://')):
             url = f"https://{url}"
         
+        # Serve recent results for the same site from cache
+        cache_key = (cls._cache_key(url), mobile, include_playwright)
+        cached = None if no_cache else cls._analysis_cache.get(cache_key)
+        if cached is not None:
+            return copy.deepcopy(cached)
+        
         # Perform parallel analysis
-        pagespeed_task = cls._analyze_pagespeed(url, mobile)
-        playwright_task = cls._analyze_with_playwright(url)
+        tasks = [cls._analyze_pagespeed(url, mobile, no_cache)]
+        if include_playwright:
+            tasks.append(cls._analyze_with_playwright(url, no_cache))
         
-        # Wait for both tasks
-        pagespeed_results, playwright_results = await asyncio.gather(
-            pagespeed_task, 
-            playwright_task
-        )
+        # Wait for both; a PageSpeed failure only leaves its scores out, but the
+        # browser results are required (https, mobile layout) and failures propagate
+        pagespeed_results, *playwright_results = await asyncio.gather(*tasks, return_exceptions=True)
+        for result in playwright_results:
+            if isinstance(result, BaseException):
+                raise result
         
         # Combine results
-        combined_results = {
-            **pagespeed_results,
-            **playwright_results
-        }
+        combined_results = {}
+        if isinstance(pagespeed_results, BaseException):
+            logging.warning(f"Partial website analysis for {url}: {pagespeed_results}")
+        else:
+            combined_results.update(pagespeed_results)
+        for result in playwright_results:
+            combined_results.update(result)
         
+        # Only cache complete analyses, so the next scan retries a failed PageSpeed call
+        if not isinstance(pagespeed_results, BaseException):
+            cls._analysis_cache.set(cache_key, copy.deepcopy(combined_results))
         return combined_results
     
+    @staticmethod
+    def _cache_key(url: str) -> str:
+        """
+        Normalize a URL so trivial variants share a cache entry.
+        
+        Args:
+            url (str): Website URL
+        
+        Returns:
+            str: URL with lowercase scheme and host and no trailing slash
+        """
+        parsed = urlparse(url)
+        return parsed._replace(
+            scheme=parsed.scheme.lower(),
+            netloc=parsed.netloc.lower(),
+            path=parsed.path.rstrip('/'),
+            fragment=''
+        ).geturl()
+    
     @classmethod
     async def _analyze_pagespeed(
         cls, 
         url: str, 
-        mobile: bool = True
+        mobile: bool = True,
+        no_cache: bool = False
     ) -> Dict[str, Any]:
         """
         Analyze website using Google PageSpeed Insights.
@@ -66,89 +143,185 @@ class WebsiteAnalyzer:
         Args:
             url (str): Website URL
             mobile (bool): Mobile or desktop analysis
+            no_cache (bool): Skip the cached result and call the API
         
         Returns:
             Dict[str, Any]: PageSpeed analysis results
+        
+        Raises:
+            Exception: If the PageSpeed API call fails (nothing is cached)
+        """
+        strategy = 'MOBILE' if mobile else 'DESKTOP'
+        cache_key = cls._pagespeed_cache_key(url, strategy)
+        
+        # Skip the quota-limited API when a recent result exists
+        cached = None if no_cache else await cls._get_cached_pagespeed(cache_key)
+        if cached is not None:
+            return cached
+        
+        # Concurrent scans of the same site share one in-flight audit
+        task = cls._pagespeed_inflight.get(cache_key)
+        if task is None:
+            task = asyncio.ensure_future(cls._fetch_pagespeed(url, strategy, cache_key))
+            cls._pagespeed_inflight[cache_key] = task
+            task.add_done_callback(lambda _: cls._pagespeed_inflight.pop(cache_key, None))
+        
+        # Shield so one caller being cancelled doesn't cancel the others' audit
+        return dict(await asyncio.shield(task))
+    
+    @classmethod
+    async def _fetch_pagespeed(
+        cls,
+        url: str,
+        strategy: str,
+        cache_key: str
+    ) -> Dict[str, Any]:
+        """
+        Call the PageSpeed Insights API and cache the extracted metrics.
+        
+        Args:
+            url (str): Website URL
+            strategy (str): PageSpeed strategy (MOBILE or DESKTOP)
+            cache_key (str): Redis key for the result
+        
+        Returns:
+            Dict[str, Any]: PageSpeed analysis results
+        
+        Raises:
+            Exception: Any API or parsing error, so callers don't cache the gap
         """
         try:
-            async with httpx.AsyncClient(timeout=90.0) as client:
-                # Build params list to include multiple categories
-                params = [
-                    ('url', url),
-                    ('key', settings.PAGESPEED_API_KEY),
-                    ('strategy', 'MOBILE' if mobile else 'DESKTOP'),
-                    ('category', 'PERFORMANCE'),
-                    ('category', 'ACCESSIBILITY'),
-                    ('category', 'BEST_PRACTICES'),
-                    ('category', 'SEO')
-                ]
-                
-                response = await client.get(cls.PAGESPEED_URL, params=params)
-                response.raise_for_status()
-                
-                data = response.json()
-                
-                # Extract key metrics
-                lighthouse_result = data.get('lighthouseResult', {})
-                categories = lighthouse_result.get('categories', {})
-                
-                return {
-                    'performance_score': categories.get('performance', {}).get('score', 0) * 100,
-                    'accessibility_score': categories.get('accessibility', {}).get('score', 0) * 100,
-                    'best_practices_score': categories.get('best-practices', {}).get('score', 0) * 100,
-                    'seo_score': categories.get('seo', {}).get('score', 0) * 100,
-                    'loading_time_ms': lighthouse_result.get('audits', {}).get('interactive', {}).get('numericValue', 0)
-                }
+            client = get_http_client()
+            
+            # Build params list to include multiple categories
+            params = [
+                ('url', url),
+                ('key', settings.PAGESPEED_API_KEY),
+                ('strategy', strategy),
+                ('category', 'PERFORMANCE'),
+                ('category', 'ACCESSIBILITY'),
+                ('category', 'BEST_PRACTICES'),
+                ('category', 'SEO')
+            ]
+            
+            # PageSpeed runs a full Lighthouse audit, so allow a longer read timeout;
+            # retry quota (429) and transient errors, but cap attempts since each is slow
+            response = await request_with_retry(
+                client, 'GET', cls.PAGESPEED_URL, PAGESPEED_SEMAPHORE,
+                max_attempts=2, params=params, timeout=cls.PAGESPEED_TIMEOUT
+            )
+            
+            data = orjson.loads(response.content)
+            
+            # Extract key metrics
+            lighthouse_result = data.get('lighthouseResult', {})
+            categories = lighthouse_result.get('categories', {})
+            
+            results = {
+                'performance_score': categories.get('performance', {}).get('score', 0) * 100,
+                'accessibility_score': categories.get('accessibility', {}).get('score', 0) * 100,
+                'best_practices_score': categories.get('best-practices', {}).get('score', 0) * 100,
+                'seo_score': categories.get('seo', {}).get('score', 0) * 100,
+                'loading_time_ms': lighthouse_result.get('audits', {}).get('interactive', {}).get('numericValue', 0)
+            }
+            
+            await cls._set_cached_pagespeed(cache_key, results)
+            return results
         
         except Exception as e:
             logging.error(f"PageSpeed Insights error for {url}: {e}")
-            # Graceful degradation - PageSpeed is optional
-            return {}
+            raise
+    
+    @classmethod
+    def _pagespeed_cache_key(cls, url: str, strategy: str) -> str:
+        """
+        Build the Redis key for a PageSpeed result.
+        
+        Args:
+            url (str): Website URL
+            strategy (str): PageSpeed strategy (MOBILE or DESKTOP)
+        
+        Returns:
+            str: Redis key
+        """
+        digest = hashlib.sha256(cls._cache_key(url).encode('utf-8')).hexdigest()
+        return f"pagespeed:{strategy}:{digest}"
+    
+    @classmethod
+    async def _get_cached_pagespeed(cls, cache_key: str) -> Optional[Dict[str, Any]]:
+        """
+        Read a cached PageSpeed result from Redis.
+        
+        Args:
+            cache_key (str): Redis key
+        
+        Returns:
+            Optional[Dict[str, Any]]: Cached metrics, or None on a miss or Redis error
+        """
+        try:
+            cached = await get_redis_client().get(cache_key)
+            return orjson.loads(cached) if cached else None
+        except Exception as e:
+            # Cache is best-effort; fall through to the live API
+            logging.warning(f"PageSpeed cache read failed: {e}")
+            return None
+    
+    @classmethod
+    async def _set_cached_pagespeed(cls, cache_key: str, results: Dict[str, Any]):
+        """
+        Store a PageSpeed result in Redis.
+        
+        Args:
+            cache_key (str): Redis key
+            results (Dict[str, Any]): Extracted PageSpeed metrics
+        """
+        try:
+            await get_redis_client().set(cache_key, orjson.dumps(results), ex=cls.PAGESPEED_CACHE_TTL)
+        except Exception as e:
+            logging.warning(f"PageSpeed cache write failed: {e}")
     
     @classmethod
-    async def _analyze_with_playwright(cls, url: str) -> Dict[str, Any]:
+    async def _analyze_with_playwright(cls, url: str, no_cache: bool = False) -> Dict[str, Any]:
         """
         Perform website analysis using Playwright.
         
         Args:
             url (str): Website URL to analyze
+            no_cache (bool): Skip the cached result and navigate again
         
         Returns:
             Dict[str, Any]: Playwright-based analysis results
         """
+        # Reuse a very recent result for the same page; failures aren't cached
+        cache_key = cls._cache_key(url)
+        cached = None if no_cache else cls._playwright_cache.get(cache_key)
+        if cached is not None:
+            return dict(cached)
+        
         try:
-            async with browser_manager.get_page() as page:
+            # The page's context skips downloading images, media and fonts
+            async with blocking_browser_manager.get_page() as page:
                 # Navigate to the website with increased timeout (30 seconds)
                 await page.goto(url, timeout=30000, wait_until='domcontentloaded')
                 
                 # Check HTTPS
                 https_enabled = page.url.startswith('https://')
                 
-                # Check mobile friendliness (viewport)
-                await page.set_viewport_size({'width': 375, 'height': 667})
-                
-                # Check for responsive design
-                body_width = await page.evaluate('() => document.body.clientWidth')
-                mobile_friendly = body_width <= 480
-                
-                # Check for key elements
-                has_contact_form = await page.evaluate(
-                    '() => document.querySelector("form[name*=contact], input[type=email]") !== null'
-                )
+                # Probe responsive layout, key elements and metadata together
+                # (the browser context is created with the 375x667 mobile viewport)
+                probe = await page.evaluate(cls.PAGE_PROBE_SCRIPT)
                 
-                # Check for online ordering links
-                online_ordering_links = await page.evaluate(
-                    '() => Array.from(document.querySelectorAll("a")).filter(a => a.href.includes("order") || a.href.includes("delivery")).length'
-                )
-                
-                return {
+                results = {
                     'https_enabled': https_enabled,
-                    'mobile_friendly': mobile_friendly,
-                    'has_contact_form': has_contact_form,
-                    'online_ordering_links_count': online_ordering_links,
-                    'page_title': await page.title(),
-                    'meta_description': await page.evaluate('() => document.querySelector("meta[name=description]")?.content')
+                    'mobile_friendly': probe['bodyWidth'] <= 480,
+                    'has_contact_form': probe['hasContactForm'],
+                    'online_ordering_links_count': probe['orderingLinks'],
+                    'page_title': probe['title'],
+                    'meta_description': probe['metaDescription']
                 }
+            
+            cls._playwright_cache.set(cache_key, dict(results))
+            return results
         
         except Exception as e:
             logging.error(f"Playwright analysis error for {url}: {e}")
@@ -165,20 +338,29 @@ class WebsiteAnalyzer:
         Returns:
             bool: Whether the website is available
         """
+        # Only confirmed-available sites are cached so failures are rechecked
+        cache_key = cls._cache_key(url)
+        if cls._availability_cache.get(cache_key):
+            return True
+        
         try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                # Try HEAD first (faster)
-                try:
-                    response = await client.head(url, follow_redirects=True)
-                    if response.status_code < 400:
-                        return True
-                except Exception:
-                    # If HEAD fails, try GET (some sites block HEAD requests)
-                    pass
-                
-                # Fallback to GET request
-                response = await client.get(url, follow_redirects=True)
-                return response.status_code < 400
+            client = get_http_client()
+            
+            # Send validators from the last check so unchanged pages answer 304
+            headers = cls._conditional_headers(cache_key)
+            
+            # Single GET that stops after the headers; many servers reject HEAD,
+            # and leaving the stream unread skips the body transfer
+            async with client.stream(
+                'GET', url, headers=headers, follow_redirects=True,
+                timeout=cls.AVAILABILITY_TIMEOUT
+            ) as response:
+                cls._store_validators(cache_key, response)
+                available = response.status_code < 400
+            
+            if available:
+                cls._availability_cache.set(cache_key, True)
+            return available
         
         except httpx.TimeoutException:
             logging.warning(f"Website availability check timed out for {url}")
@@ -186,4 +368,37 @@ class WebsiteAnalyzer:
             return True
         except Exception as e:
             logging.warning(f"Website availability check failed for {url}: {e}")
-            return False
\ No newline at end of file
+            return False
+    
+    @classmethod
+    def _conditional_headers(cls, cache_key: str) -> Dict[str, str]:
+        """
+        Build conditional request headers from previously seen validators.
+        
+        Args:
+            cache_key (str): Normalized website URL
+        
+        Returns:
+            Dict[str, str]: If-None-Match / If-Modified-Since headers, if known
+        """
+        validators = cls._validators_cache.get(cache_key) or {}
+        headers = {}
+        if validators.get('etag'):
+            headers['If-None-Match'] = validators['etag']
+        if validators.get('last_modified'):
+            headers['If-Modified-Since'] = validators['last_modified']
+        return headers
+    
+    @classmethod
+    def _store_validators(cls, cache_key: str, response: httpx.Response):
+        """
+        Remember a response's ETag / Last-Modified for the next check.
+        
+        Args:
+            cache_key (str): Normalized website URL
+            response (httpx.Response): Response from the website
+        """
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if etag or last_modified:
+            cls._validators_cache.set(cache_key, {'etag': etag, 'last_modified': last_modified})
\ No newline at end of file
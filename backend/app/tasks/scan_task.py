@@ -2,7 +2,7 @@ import logging
 from typing import Dict, Any
 
 from celery import shared_task
-from celery.signals import task_success, task_failure
+from celery.signals import task_success, task_failure, worker_process_init
 
 from ..services.restaurant_search import RestaurantSearchService
 from ..services.scan_orchestrator import ScanOrchestrator
@@ -13,6 +13,45 @@ from ..models.restaurant import RestaurantCreate
 from ..models.scan import ScanStatus, ScanInDB
 from ..database import database
 
+# Services shared by every task run in this worker process
+_services: Dict[str, Any] = {}
+
+@worker_process_init.connect
+def install_event_loop_policy(**kwargs):
+    """
+    Use uvloop for event loops created in this worker process, if available.
+    """
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        # uvloop isn't available on Windows; the default loop works fine
+        pass
+
+@worker_process_init.connect
+def init_worker_services(**kwargs):
+    """
+    Build the email, evidence and narrative services once per worker process.
+    """
+    _services['email'] = EmailService()
+    _services['evidence'] = EvidenceStorageService()
+    _services['narrative'] = AInarrative()
+
+def _get_service(name: str) -> Any:
+    """
+    Get a shared service, building them if the worker hook hasn't run
+    (e.g. tasks executed eagerly outside a worker).
+    
+    Args:
+        name (str): Service name ('email', 'evidence' or 'narrative')
+    
+    Returns:
+        Any: Shared service instance
+    """
+    if not _services:
+        init_worker_services()
+    return _services[name]
+
 @shared_task(
     bind=True, 
     max_retries=3, 
@@ -40,12 +79,11 @@ def perform_restaurant_scan(
         scan_result = ScanOrchestrator.perform_comprehensive_scan(restaurant)
         
         # Generate AI narrative
-        ai_narrative = AInarrative().generate_narrative(scan_result)
+        ai_narrative = _get_service('narrative').generate_narrative(scan_result)
         scan_result['ai_narrative'] = ai_narrative
         
         # Store evidence
-        evidence_storage = EvidenceStorageService()
-        evidence_result = evidence_storage.store_scan_evidence(
+        evidence_result = _get_service('evidence').store_scan_evidence(
             scan_id=scan_result['id'], 
             evidence_data=scan_result
         )
@@ -71,8 +109,7 @@ def handle_scan_success(sender, result, **kwargs):
     """
     try:
         # Send email with results
-        email_service = EmailService()
-        email_service.send_scan_results_email(
+        _get_service('email').send_scan_results_email(
             email=result.get('contact_email', ''),
             restaurant_name=result.get('restaurant_name', 'Unknown Restaurant'),
             scan_results=result
@@ -105,8 +142,7 @@ def handle_scan_failure(sender, exception, traceback, **kwargs):
         )
         
         # Send error notification
-        email_service = EmailService()
-        email_service.send_error_notification(
+        _get_service('email').send_error_notification(
             error_message=str(exception),
             traceback=traceback
         )
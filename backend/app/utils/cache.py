@@ -0,0 +1,91 @@
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+import redis.asyncio as redis
+
+from ..config import settings
+
+# Shared Redis client for cross-process result caching (created lazily)
+_redis_client: Optional[redis.Redis] = None
+
+def get_redis_client() -> redis.Redis:
+    """
+    Get the process-wide async Redis client, creating it on first use.
+
+    Returns:
+        redis.Redis: Client connected to settings.REDIS_URL
+    """
+    global _redis_client
+    if _redis_client is None:
+        _redis_client = redis.from_url(settings.REDIS_URL)
+    return _redis_client
+
+async def close_redis_client():
+    """
+    Close the shared Redis client and release its connections.
+    """
+    global _redis_client
+    if _redis_client is not None:
+        await _redis_client.aclose()
+        _redis_client = None
+
+class TTLCache:
+    """
+    Small in-process LRU cache whose entries expire after a fixed time.
+    Used to skip repeated network calls for results that rarely change.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 1800.0):
+        """
+        Initialize an empty cache.
+
+        Args:
+            maxsize (int): Maximum number of entries before evicting the oldest
+            ttl (float): Seconds an entry stays valid
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        Get a cached value if present and not expired.
+
+        Args:
+            key (Hashable): Cache key
+
+        Returns:
+            Optional[Any]: Cached value, or None on a miss
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+
+        # Mark as most recently used
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any):
+        """
+        Store a value, evicting the least recently used entry when full.
+
+        Args:
+            key (Hashable): Cache key
+            value (Any): Value to cache
+        """
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        """
+        Remove all entries.
+        """
+        self._entries.clear()
@@ -0,0 +1,158 @@
+import asyncio
+import logging
+import random
+from typing import Any, Awaitable, Callable, Optional, TypeVar
+
+import httpx
+
+T = TypeVar('T')
+
+# Per-upstream concurrency limits to stay under provider rate limits
+GOOGLE_PLACES_SEMAPHORE = asyncio.Semaphore(10)
+OVERPASS_SEMAPHORE = asyncio.Semaphore(2)
+PAGESPEED_SEMAPHORE = asyncio.Semaphore(5)
+
+# Status codes worth retrying (rate limiting and transient server errors)
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# Default timeouts: fail fast on connect and pool waits, allow slower reads
+DEFAULT_TIMEOUT = httpx.Timeout(15.0, connect=5.0, pool=5.0)
+
+# Shared connection pool for outbound API calls (created lazily)
+_shared_client: Optional[httpx.AsyncClient] = None
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Get the process-wide HTTP client, creating it on first use.
+
+    Reusing one client keeps TCP/TLS connections alive across calls instead
+    of paying a new handshake for every request. HTTP/2 is negotiated where
+    the server supports it (Google APIs do), so concurrent calls multiplex
+    over one connection. Override the default timeout per request where an
+    API needs longer.
+
+    Returns:
+        httpx.AsyncClient: Shared client with a bounded connection pool
+    """
+    global _shared_client
+    if _shared_client is None or _shared_client.is_closed:
+        _shared_client = httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(max_connections=50, max_keepalive_connections=20),
+            timeout=DEFAULT_TIMEOUT
+        )
+    return _shared_client
+
+async def close_http_client():
+    """
+    Close the shared HTTP client and release its pooled connections.
+    """
+    global _shared_client
+    if _shared_client is not None:
+        await _shared_client.aclose()
+        _shared_client = None
+
+def _is_retryable(error: Exception) -> bool:
+    """
+    Determine whether a failed HTTP call should be retried.
+
+    Args:
+        error (Exception): Exception raised by the HTTP call
+
+    Returns:
+        bool: True for transport errors and retryable status codes
+    """
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code in RETRYABLE_STATUS_CODES
+    return isinstance(error, httpx.TransportError)
+
+def _retry_after_seconds(error: Exception) -> Optional[float]:
+    """
+    Read a numeric Retry-After header from a failed response, if present.
+
+    Args:
+        error (Exception): Exception raised by the HTTP call
+
+    Returns:
+        Optional[float]: Seconds to wait, or None if not provided
+    """
+    if not isinstance(error, httpx.HTTPStatusError):
+        return None
+    try:
+        return float(error.response.headers.get('Retry-After', ''))
+    except ValueError:
+        return None
+
+async def with_retry(
+    operation: Callable[[], Awaitable[T]],
+    semaphore: Optional[asyncio.Semaphore] = None,
+    max_attempts: int = 4,
+    base_delay: float = 0.5,
+    max_delay: float = 8.0
+) -> T:
+    """
+    Run an HTTP operation with exponential backoff on transient failures.
+
+    The semaphore (if given) is held only while the operation runs, so
+    callers waiting out a backoff don't block other requests.
+
+    Args:
+        operation (Callable[[], Awaitable[T]]): Coroutine factory performing the call
+        semaphore (Optional[asyncio.Semaphore]): Upstream concurrency limit
+        max_attempts (int): Maximum number of attempts
+        base_delay (float): Delay before the first retry in seconds
+        max_delay (float): Upper bound for a single delay in seconds
+
+    Returns:
+        T: Result of the operation
+
+    Raises:
+        Exception: The last error if all attempts fail or the error is not retryable
+    """
+    for attempt in range(1, max_attempts + 1):
+        try:
+            if semaphore is None:
+                return await operation()
+            async with semaphore:
+                return await operation()
+        except Exception as e:
+            if attempt == max_attempts or not _is_retryable(e):
+                raise
+
+            delay = _retry_after_seconds(e)
+            if delay is None:
+                # Exponential backoff with jitter to avoid synchronized retries
+                delay = base_delay * (2 ** (attempt - 1)) * random.uniform(0.5, 1.5)
+            delay = min(delay, max_delay)
+
+            logging.warning(f"HTTP call failed ({e}), retrying in {delay:.1f}s (attempt {attempt}/{max_attempts})")
+            await asyncio.sleep(delay)
+
+async def request_with_retry(
+    client: httpx.AsyncClient,
+    method: str,
+    url: str,
+    semaphore: Optional[asyncio.Semaphore] = None,
+    max_attempts: int = 4,
+    **kwargs: Any
+) -> httpx.Response:
+    """
+    Send a request and raise for status, retrying transient failures.
+
+    Args:
+        client (httpx.AsyncClient): Client used to send the request
+        method (str): HTTP method
+        url (str): Request URL
+        semaphore (Optional[asyncio.Semaphore]): Upstream concurrency limit
+        max_attempts (int): Maximum number of attempts
+        **kwargs: Extra arguments passed to client.request
+
+    Returns:
+        httpx.Response: Successful response
+    """
+    async def send() -> httpx.Response:
+        response = await client.request(method, url, **kwargs)
+        response.raise_for_status()
+        return response
+
+    return await with_retry(send, semaphore, max_attempts=max_attempts)
@@ -1,9 +1,34 @@
+import atexit
 import logging
+import logging.handlers
+import os
+import queue
 import sys
-import json
 from typing import Dict, Any, Optional
 from datetime import datetime
 
+import orjson
+
+# (second, ISO prefix) of the last formatted timestamp; records in the same
+# second reuse the prefix instead of building a datetime each
+_timestamp_cache = [None, '']
+
+def _format_timestamp(created: float) -> str:
+    """
+    Format a record's creation time as an ISO-8601 UTC timestamp.
+    
+    Args:
+        created (float): Epoch seconds from LogRecord.created
+    
+    Returns:
+        str: Timestamp like 2024-01-01T12:00:00.123456
+    """
+    second = int(created)
+    if _timestamp_cache[0] != second:
+        _timestamp_cache[1] = datetime.utcfromtimestamp(second).isoformat()
+        _timestamp_cache[0] = second
+    return f"{_timestamp_cache[1]}.{int((created - second) * 1e6):06d}"
+
 class StructuredLogger:
     """
     Advanced structured logging utility with JSON formatting and multiple output options.
@@ -34,13 +59,61 @@ class StructuredLogger:
         # Console handler with JSON formatter
         console_handler = logging.StreamHandler(sys.stdout)
         console_handler.setFormatter(self._JSONFormatter())
-        self.logger.addHandler(console_handler)
+        handlers = [console_handler]
         
-        # Optional file handler
+        # Optional file handler, rotated at 10 MB; records are buffered and
+        # written in batches of 512 (or immediately from WARNING up)
         if log_file:
-            file_handler = logging.FileHandler(log_file)
+            file_handler = logging.handlers.RotatingFileHandler(
+                log_file, maxBytes=10 * 1024 * 1024, backupCount=5, delay=True
+            )
             file_handler.setFormatter(self._JSONFormatter())
-            self.logger.addHandler(file_handler)
+            handlers.append(logging.handlers.MemoryHandler(
+                capacity=512,
+                flushLevel=logging.WARNING,
+                target=file_handler,
+                flushOnClose=True
+            ))
+        
+        # Callers only enqueue records; a background thread formats and writes
+        # them so stream/file I/O never blocks the event loop
+        self._handlers = handlers
+        self._queue_handler = logging.handlers.QueueHandler(queue.SimpleQueue())
+        self.logger.addHandler(self._queue_handler)
+        self._start_listener()
+        
+        # Threads don't survive fork (e.g. Celery prefork workers importing this
+        # module in the parent), so each child needs its own listener
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=self._restart_listener)
+        
+        # Flush queued records on interpreter exit
+        atexit.register(self._stop_listener)
+    
+    def _start_listener(self):
+        """
+        Start a listener thread draining the queue handler's queue into the output handlers.
+        """
+        self._listener = logging.handlers.QueueListener(
+            self._queue_handler.queue, *self._handlers, respect_handler_level=True
+        )
+        self._listener.start()
+    
+    def _restart_listener(self):
+        """
+        Give a forked child a fresh queue and listener thread.
+        
+        The inherited listener's thread doesn't exist in the child, so records
+        put on the inherited queue would never be written.
+        """
+        self._queue_handler.queue = queue.SimpleQueue()
+        self._start_listener()
+    
+    def _stop_listener(self):
+        """
+        Flush queued records and stop this process's listener thread.
+        """
+        self._listener.stop()
     
     def _format_log_data(
         self, 
@@ -57,10 +130,9 @@ class StructuredLogger:
             extra (Optional[Dict[str, Any]]): Additional context
         
         Returns:
-            Dict[str, Any]: Structured log data
+            Dict[str, Any]: Structured log data (the formatter adds the timestamp)
         """
         log_data = {
-            'timestamp': datetime.utcnow().isoformat(),
             'level': level,
             'message': message,
             'logger_name': self.logger.name
@@ -83,8 +155,12 @@ class StructuredLogger:
             message (str): Debug message
             extra (Optional[Dict[str, Any]]): Additional context
         """
+        # Skip building the record when this level is filtered out
+        if not self.logger.isEnabledFor(logging.DEBUG):
+            return
+        
         log_data = self._format_log_data('DEBUG', message, extra)
-        self.logger.debug(json.dumps(log_data))
+        self.logger.debug(message, extra={'structured': log_data})
     
     def info(
         self, 
@@ -98,8 +174,12 @@ class StructuredLogger:
             message (str): Info message
             extra (Optional[Dict[str, Any]]): Additional context
         """
+        # Skip building the record when this level is filtered out
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
+        
         log_data = self._format_log_data('INFO', message, extra)
-        self.logger.info(json.dumps(log_data))
+        self.logger.info(message, extra={'structured': log_data})
     
     def warning(
         self, 
@@ -113,8 +193,12 @@ class StructuredLogger:
             message (str): Warning message
             extra (Optional[Dict[str, Any]]): Additional context
         """
+        # Skip building the record when this level is filtered out
+        if not self.logger.isEnabledFor(logging.WARNING):
+            return
+        
         log_data = self._format_log_data('WARNING', message, extra)
-        self.logger.warning(json.dumps(log_data))
+        self.logger.warning(message, extra={'structured': log_data})
     
     def error(
         self, 
@@ -131,7 +215,7 @@ class StructuredLogger:
             exc_info (bool): Whether to include exception information
         """
         log_data = self._format_log_data('ERROR', message, extra)
-        self.logger.error(json.dumps(log_data), exc_info=exc_info)
+        self.logger.error(message, extra={'structured': log_data}, exc_info=exc_info)
     
     def critical(
         self, 
@@ -148,7 +232,7 @@ class StructuredLogger:
             exc_info (bool): Whether to include exception information
         """
         log_data = self._format_log_data('CRITICAL', message, extra)
-        self.logger.critical(json.dumps(log_data), exc_info=exc_info)
+        self.logger.critical(message, extra={'structured': log_data}, exc_info=exc_info)
     
     class _JSONFormatter(logging.Formatter):
         """
@@ -164,19 +248,22 @@ class StructuredLogger:
             Returns:
                 str: JSON-formatted log message
             """
-            try:
-                # Try to parse the message as JSON
-                log_data = json.loads(record.msg)
-            except (TypeError, json.JSONDecodeError):
-                # If not JSON, create a basic log structure
+            timestamp = _format_timestamp(record.created)
+            
+            # StructuredLogger passes its dict along on the record
+            structured = getattr(record, 'structured', None)
+            if structured is not None:
+                log_data = {'timestamp': timestamp, **structured}
+            else:
+                # Plain logging calls get a basic log structure
                 log_data = {
-                    'timestamp': datetime.utcnow().isoformat(),
+                    'timestamp': timestamp,
                     'level': record.levelname,
-                    'message': record.msg,
+                    'message': record.getMessage(),
                     'logger_name': record.name
                 }
             
-            return json.dumps(log_data)
+            return orjson.dumps(log_data, default=str).decode()
 
 # Create a default logger instance
 logger = StructuredLogger('restaurantgrader')
\ No newline at end of file
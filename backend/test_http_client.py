@@ -0,0 +1,71 @@
+import asyncio
+import unittest
+from unittest import mock
+import httpx
+from app.utils import http_client
+from app.utils.http_client import request_with_retry
+
+URL = "https://api.example.com/resource"
+
+class TestRequestWithRetry(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        """Record backoff delays instead of waiting them out."""
+        self.sleep = mock.AsyncMock()
+        patcher = mock.patch.object(http_client.asyncio, 'sleep', self.sleep)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def make_client(self, responses):
+        """Client whose requests get the given responses in order."""
+        self.requests = []
+        responses = iter(responses)
+
+        def handler(request):
+            self.requests.append(request)
+            return next(responses)
+
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        self.addAsyncCleanup(client.aclose)
+        return client
+
+    async def test_rate_limit_honors_capped_retry_after(self):
+        """A 429 should be retried after Retry-After, capped at the maximum delay."""
+        client = self.make_client([
+            httpx.Response(429, headers={"Retry-After": "120"}),
+            httpx.Response(200, json={"ok": True})
+        ])
+
+        response = await request_with_retry(client, "GET", URL)
+
+        self.assertEqual(response.json(), {"ok": True})
+        self.assertEqual(len(self.requests), 2)
+        self.sleep.assert_awaited_once_with(8.0)
+
+    async def test_client_error_is_not_retried(self):
+        """A 4xx other than 429 should raise on the first attempt."""
+        client = self.make_client([httpx.Response(404)])
+
+        with self.assertRaises(httpx.HTTPStatusError) as ctx:
+            await request_with_retry(client, "GET", URL)
+
+        self.assertEqual(ctx.exception.response.status_code, 404)
+        self.assertEqual(len(self.requests), 1)
+        self.sleep.assert_not_awaited()
+
+    async def test_semaphore_released_during_backoff(self):
+        """The semaphore should be held for each request but not while backing off."""
+        semaphore = asyncio.Semaphore(1)
+        held = []
+        self.sleep.side_effect = lambda delay: held.append(semaphore.locked())
+        client = self.make_client([httpx.Response(503), httpx.Response(503), httpx.Response(200)])
+        client.event_hooks["request"] = [mock.AsyncMock(side_effect=lambda request: held.append(semaphore.locked()))]
+
+        response = await request_with_retry(client, "GET", URL, semaphore)
+
+        self.assertEqual(response.status_code, 200)
+        # request, backoff, request, backoff, request
+        self.assertEqual(held, [True, False, True, False, True])
+        self.assertFalse(semaphore.locked())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -4,11 +4,66 @@ Tests complete flow: Browser automation + Order detection + Scoring
 """
 
 import asyncio
+import os
+import sys
 import time
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Dict, List, Any
-from app.core.browser import BrowserManager
-from app.core.scoring import RestaurantScorer
+from typing import Dict, List, Any, NamedTuple, Optional
+from testing_helpers import disk_memoize
+
+CATEGORIES = ("website", "google", "reviews", "ordering")
+
+# Category, label and weight as applied by RestaurantScorer.calculate_overall_score
+WEIGHT_LABELS = (
+    ("website", "Website", "30%"),
+    ("google", "Google", "30%"),
+    ("reviews", "Reviews", "25%"),
+    ("ordering", "Ordering", "15%")
+)
+
+# Page loads per site before a timeout counts as a failure
+BROWSER_ATTEMPTS = 3
+
+
+class Restaurant(NamedTuple):
+    """A site under test"""
+    name: str
+    url: str
+    expected_order_button: bool
+
+
+@dataclass(slots=True)
+class Result:
+    """Outcome of testing one restaurant"""
+    name: str
+    url: str
+    success: bool = False
+    error: Optional[str] = None
+    browser_data: Dict[str, Any] = field(default_factory=dict)
+    scores: Dict[str, Any] = field(default_factory=dict)
+    duration: float = 0
+
+
+@disk_memoize(ttl=3600, cache_if=lambda data: not data.get("error"))
+async def analyze_site(url: str) -> Dict[str, Any]:
+    """Browser analysis for one site, cached on disk between runs"""
+    # Deferred so the script starts fast; only a cache miss needs Playwright
+    from app.core.browser import BrowserManager
+    
+    for attempt in range(1, BROWSER_ATTEMPTS + 1):
+        # Fresh context on the shared browser, so sites can run concurrently
+        async with BrowserManager(use_shared_browser=True, block_resources=True) as browser_manager:
+            browser_data = await browser_manager.analyze_website(url)
+        
+        # analyze_website reports failures in "error"; only timeouts are worth retrying
+        error = browser_data.get("error") or ""
+        if "timeout" not in error.lower() or attempt == BROWSER_ATTEMPTS:
+            return browser_data
+        
+        delay = 2 ** attempt
+        print(f"  ⏳ {url} timed out, retrying in {delay}s (attempt {attempt}/{BROWSER_ATTEMPTS})")
+        await asyncio.sleep(delay)
 
 
 class IntegrationTest:
@@ -16,43 +71,23 @@ class IntegrationTest:
     
     def __init__(self):
         self.browser_manager = None
+        from app.core.scoring import RestaurantScorer
         self.scorer = RestaurantScorer()
         self.results = []
         self.start_time = None
         self.end_time = None
+        # Sites scanned at once; more than a few pages at a time slows every scan
+        self.concurrency = int(os.environ.get("SCAN_CONCURRENCY", 4))
+        self._sem = asyncio.Semaphore(self.concurrency)
         
     # Test restaurant URLs (including user-requested websites)
     RESTAURANTS = [
-        {
-            "name": "Chipotle",
-            "url": "https://www.chipotle.com",
-            "expected_order_button": True
-        },
-        {
-            "name": "Desi Curry",
-            "url": "https://desicurry.us/",
-            "expected_order_button": True
-        },
-        {
-            "name": "Yummee Sandwiches",
-            "url": "http://www.yummeesandwiches.com/",
-            "expected_order_button": True
-        },
-        {
-            "name": "La KaViet",
-            "url": "https://lakaviet.com",
-            "expected_order_button": True
-        },
-        {
-            "name": "Panera Bread",
-            "url": "https://www.panerabread.com",
-            "expected_order_button": True
-        },
-        {
-            "name": "Burger Town USA",
-            "url": "https://www.burgertownusa.net/",
-            "expected_order_button": True
-        }
+        Restaurant("Chipotle", "https://www.chipotle.com", True),
+        Restaurant("Desi Curry", "https://desicurry.us/", True),
+        Restaurant("Yummee Sandwiches", "http://www.yummeesandwiches.com/", True),
+        Restaurant("La KaViet", "https://lakaviet.com", True),
+        Restaurant("Panera Bread", "https://www.panerabread.com", True),
+        Restaurant("Burger Town USA", "https://www.burgertownusa.net/", True)
     ]
     
     def create_mock_scoring_data(self, restaurant_name: str, browser_data: Dict) -> Dict:
@@ -108,57 +143,48 @@ class IntegrationTest:
             "ordering_data": ordering_data
         }
     
-    async def test_restaurant(self, restaurant: Dict) -> Dict[str, Any]:
+    async def test_restaurant(self, restaurant: Restaurant) -> Result:
         """Test a single restaurant website"""
         
-        print(f"\n{'='*60}")
-        print(f"Testing: {restaurant['name']}")
-        print(f"URL: {restaurant['url']}")
-        print(f"{'='*60}")
-        
         test_start = time.time()
-        result = {
-            "name": restaurant["name"],
-            "url": restaurant["url"],
-            "success": False,
-            "error": None,
-            "browser_data": {},
-            "scores": {},
-            "duration": 0
-        }
+        result = Result(name=restaurant.name, url=restaurant.url)
+        
+        # Sites run concurrently, so collect this site's output and print it in one block
+        out = [
+            f"\n{'='*60}",
+            f"Testing: {restaurant.name}",
+            f"URL: {restaurant.url}",
+            f"{'='*60}"
+        ]
         
         try:
             # Step 1: Browser Analysis
-            print("\n🌐 Running browser analysis...")
-            async with BrowserManager() as browser_manager:
-                browser_data = await browser_manager.analyze_website(restaurant["url"])
-            result["browser_data"] = browser_data
+            browser_data = await analyze_site(restaurant.url)
+            result.browser_data = browser_data
             
             # Display browser analysis results
-            print("\nBrowser Analysis Results:")
-            print(f"  {'✅' if browser_data.get('has_ssl') else '❌'} SSL: {browser_data.get('has_ssl')}")
-            print(f"  {'✅' if browser_data.get('mobile_responsive') else '❌'} Mobile Friendly: {browser_data.get('mobile_responsive')}")
-            print(f"  📄 Title: {browser_data.get('page_title', 'N/A')[:50]}")
+            out.append("\nBrowser Analysis Results:")
+            out.append(f"  {'✅' if browser_data.get('has_ssl') else '❌'} SSL: {browser_data.get('has_ssl')}")
+            out.append(f"  {'✅' if browser_data.get('mobile_responsive') else '❌'} Mobile Friendly: {browser_data.get('mobile_responsive')}")
+            out.append(f"  📄 Title: {browser_data.get('page_title', 'N/A')[:50]}")
             
             order_button_detected = browser_data.get('order_button_detected')
             button_text = browser_data.get('button_text')
             if order_button_detected and button_text:
-                print(f"  ✅ Order Button: Found \"{button_text}\"")
+                out.append(f"  ✅ Order Button: Found \"{button_text}\"")
             else:
-                print(f"  ❌ Order Button: Not found")
+                out.append(f"  ❌ Order Button: Not found")
                 
             platforms = browser_data.get('platforms', [])
             if platforms:
-                print(f"  🍔 Platforms: {', '.join(platforms)}")
+                out.append(f"  🍔 Platforms: {', '.join(platforms)}")
             else:
-                print(f"  🍔 Platforms: None detected")
+                out.append(f"  🍔 Platforms: None detected")
             
             # Step 2: Create mock scoring data
-            print("\n📊 Creating mock scoring data...")
-            mock_data = self.create_mock_scoring_data(restaurant["name"], browser_data)
+            mock_data = self.create_mock_scoring_data(restaurant.name, browser_data)
             
             # Step 3: Calculate individual category scores
-            print("🧮 Calculating scores...")
             website_score = self.scorer.calculate_website_score(mock_data["website_data"])
             google_score = self.scorer.calculate_google_score(mock_data["google_data"])
             reviews_score = self.scorer.calculate_reviews_score(mock_data["reviews_data"])
@@ -175,76 +201,90 @@ class IntegrationTest:
             scores = self.scorer.calculate_overall_score(category_scores)
             
             # Add letter grades for each category
-            def get_letter_grade(score):
-                if score >= 90: return 'A'
-                elif score >= 80: return 'B'
-                elif score >= 70: return 'C'
-                elif score >= 60: return 'D'
-                else: return 'F'
-            
             scores['category_grades'] = {
-                category: get_letter_grade(score)
+                category: self.scorer.letter_grade(score)
                 for category, score in scores['category_scores'].items()
             }
             
-            result["scores"] = scores
+            result.scores = scores
             
             # Display scoring results
-            print("\n" + "="*60)
-            print("SCORING RESULTS")
-            print("="*60)
-            print(f"\nCategory Scores:")
-            print(f"  Website Score:  {scores['category_scores']['website']:.1f}/100 (Grade: {scores['category_grades']['website']})")
-            print(f"  Google Score:   {scores['category_scores']['google']:.1f}/100 (Grade: {scores['category_grades']['google']})")
-            print(f"  Reviews Score:  {scores['category_scores']['reviews']:.1f}/100 (Grade: {scores['category_grades']['reviews']})")
-            print(f"  Ordering Score: {scores['category_scores']['ordering']:.1f}/100 (Grade: {scores['category_grades']['ordering']})")
+            out.append("\n" + "="*60)
+            out.append(f"SCORING RESULTS - {restaurant.name}")
+            out.append("="*60)
+            out.append(f"\nCategory Scores:")
+            out.append(f"  Website Score:  {scores['category_scores']['website']:.1f}/100 (Grade: {scores['category_grades']['website']})")
+            out.append(f"  Google Score:   {scores['category_scores']['google']:.1f}/100 (Grade: {scores['category_grades']['google']})")
+            out.append(f"  Reviews Score:  {scores['category_scores']['reviews']:.1f}/100 (Grade: {scores['category_grades']['reviews']})")
+            out.append(f"  Ordering Score: {scores['category_scores']['ordering']:.1f}/100 (Grade: {scores['category_grades']['ordering']})")
             
-            print(f"\n🎯 Overall Score: {scores['overall_score']:.1f}/100")
-            print(f"📝 Letter Grade: {scores['letter_grade']}")
+            out.append(f"\n🎯 Overall Score: {scores['overall_score']:.1f}/100")
+            out.append(f"📝 Letter Grade: {scores['letter_grade']}")
             
-            print(f"\nWeighted Breakdown:")
-            weights = {'website': 0.30, 'google': 0.30, 'reviews': 0.25, 'ordering': 0.15}
-            for category, weight in weights.items():
-                weighted_score = scores['category_scores'][category] * weight
-                print(f"  {category.capitalize()}: {weighted_score:.2f} ({weight*100:.0f}%)")
+            # The scorer already returns each weighted score; only label them here
+            out.append(f"\nWeighted Breakdown:")
+            out.extend(
+                f"  {label}: {scores['weighted_scores'][category]:.2f} ({percent})"
+                for category, label, percent in WEIGHT_LABELS
+            )
             
-            result["success"] = True
+            result.success = True
             
         except Exception as e:
-            print(f"\n❌ Error testing {restaurant['name']}: {str(e)}")
-            result["error"] = str(e)
+            out.append(f"\n❌ Error testing {restaurant.name}: {str(e)}")
+            result.error = str(e)
             
         finally:
             test_end = time.time()
-            result["duration"] = test_end - test_start
-            print(f"\n⏱️  Test duration: {result['duration']:.2f}s")
+            result.duration = test_end - test_start
+            out.append(f"\n⏱️  Test duration: {result.duration:.2f}s")
+            print("\n".join(out))
             
         return result
     
+    async def _test_restaurant_bounded(self, restaurant: Restaurant) -> Result:
+        """Test a restaurant once a concurrency slot is free (see SCAN_CONCURRENCY)"""
+        async with self._sem:
+            return await self.test_restaurant(restaurant)
+    
     async def run_all_tests(self):
         """Run tests on all restaurants"""
         
         print("\n" + "="*60)
         print("RESTAURANT GRADER - INTEGRATION TEST")
         print("="*60)
-        print(f"Testing {len(self.RESTAURANTS)} restaurant websites")
+        print(f"Testing {len(self.RESTAURANTS)} restaurant websites ({self.concurrency} at a time)")
         print(f"Started at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
         print("="*60)
         
         self.start_time = time.time()
         
-        # Test each restaurant
-        for restaurant in self.RESTAURANTS:
-            result = await self.test_restaurant(restaurant)
-            self.results.append(result)
-            
-            # Small delay between tests
-            await asyncio.sleep(1)
-        
-        self.end_time = time.time()
+        # Test all restaurants concurrently, collecting each result as its site finishes
+        tasks = [asyncio.create_task(self._test_restaurant_bounded(restaurant)) for restaurant in self.RESTAURANTS]
+        self.results = []
         
-        # Generate summary report
-        self.generate_summary_report()
+        try:
+            for next_result in asyncio.as_completed(tasks):
+                result = await next_result
+                self.results.append(result)
+                self._print_incremental(result)
+        except (asyncio.CancelledError, KeyboardInterrupt):
+            # Interrupted: stop the remaining sites but still report what finished
+            print(f"\n\n⚠️  Interrupted after {len(self.results)}/{len(tasks)} sites")
+            for task in tasks:
+                task.cancel()
+            raise
+        finally:
+            self.end_time = time.time()
+            
+            # Generate summary report
+            if self.results:
+                self.generate_summary_report()
+    
+    def _print_incremental(self, result: Result):
+        """Print a one-line progress update for a finished site"""
+        status = "✅" if result.success else "❌"
+        print(f"\n{status} [{len(self.results)}/{len(self.RESTAURANTS)}] {result.name} finished in {result.duration:.2f}s")
     
     def generate_summary_report(self):
         """Generate comprehensive summary report"""
@@ -253,9 +293,55 @@ class IntegrationTest:
         print("INTEGRATION TEST SUMMARY REPORT")
         print("="*60)
         
-        # Calculate statistics
+        # Gather every statistic, table row and issue in one pass over the results
         total_tests = len(self.results)
-        successful_tests = sum(1 for r in self.results if r["success"])
+        successful_tests = 0
+        ssl_count = mobile_count = order_button_count = 0
+        totals = dict.fromkeys(CATEGORIES + ("overall",), 0.0)
+        rows = []
+        issues = []
+        fastest = slowest = None
+        
+        for result in self.results:
+            browser_data = result.browser_data
+            has_ssl = browser_data.get("has_ssl")
+            mobile_friendly = browser_data.get("mobile_responsive")
+            order_button = browser_data.get("order_button_detected")
+            ssl_count += bool(has_ssl)
+            mobile_count += bool(mobile_friendly)
+            order_button_count += bool(order_button)
+            
+            if result.success:
+                successful_tests += 1
+                category_scores = result.scores["category_scores"]
+                for category in CATEGORIES:
+                    totals[category] += category_scores[category]
+                totals["overall"] += result.scores["overall_score"]
+                
+                status = "✅ PASS"
+                overall = f"{result.scores['overall_score']:.1f}"
+                grade = result.scores['letter_grade']
+                
+                if not has_ssl:
+                    issues.append(f"  ⚠️  {result.name}: No SSL certificate")
+                if not mobile_friendly:
+                    issues.append(f"  ⚠️  {result.name}: Not mobile friendly")
+                if not order_button:
+                    issues.append(f"  ⚠️  {result.name}: No order button detected")
+            else:
+                status = "❌ FAIL"
+                overall = "N/A"
+                grade = "N/A"
+                issues.append(f"  ❌ {result.name}: {result.error}")
+            
+            duration = f"{result.duration:.2f}s"
+            rows.append(f"{result.name:<20} {status:<10} {overall:<10} {grade:<8} {duration:<8}")
+            
+            if fastest is None or result.duration < fastest.duration:
+                fastest = result
+            if slowest is None or result.duration > slowest.duration:
+                slowest = result
+        
         failed_tests = total_tests - successful_tests
         success_rate = (successful_tests / total_tests * 100) if total_tests > 0 else 0
         
@@ -270,28 +356,16 @@ class IntegrationTest:
         print(f"  Total Duration: {total_duration:.2f}s")
         print(f"  Average Time per Scan: {avg_duration:.2f}s")
         
-        # Calculate average scores
+        # Average scores
         if successful_tests > 0:
-            successful_results = [r for r in self.results if r["success"]]
-            
-            avg_overall = sum(r["scores"]["overall_score"] for r in successful_results) / successful_tests
-            avg_website = sum(r["scores"]["category_scores"]["website"] for r in successful_results) / successful_tests
-            avg_google = sum(r["scores"]["category_scores"]["google"] for r in successful_results) / successful_tests
-            avg_reviews = sum(r["scores"]["category_scores"]["reviews"] for r in successful_results) / successful_tests
-            avg_ordering = sum(r["scores"]["category_scores"]["ordering"] for r in successful_results) / successful_tests
-            
             print(f"\n📈 Average Scores:")
-            print(f"  Overall: {avg_overall:.1f}/100")
-            print(f"  Website: {avg_website:.1f}/100")
-            print(f"  Google: {avg_google:.1f}/100")
-            print(f"  Reviews: {avg_reviews:.1f}/100")
-            print(f"  Ordering: {avg_ordering:.1f}/100")
+            print(f"  Overall: {totals['overall'] / successful_tests:.1f}/100")
+            print(f"  Website: {totals['website'] / successful_tests:.1f}/100")
+            print(f"  Google: {totals['google'] / successful_tests:.1f}/100")
+            print(f"  Reviews: {totals['reviews'] / successful_tests:.1f}/100")
+            print(f"  Ordering: {totals['ordering'] / successful_tests:.1f}/100")
         
         # Browser analysis summary
-        ssl_count = sum(1 for r in self.results if r.get("browser_data", {}).get("has_ssl"))
-        mobile_count = sum(1 for r in self.results if r.get("browser_data", {}).get("mobile_responsive"))
-        order_button_count = sum(1 for r in self.results if r.get("browser_data", {}).get("order_button_detected"))
-        
         print(f"\n🌐 Browser Analysis Summary:")
         print(f"  SSL Enabled: {ssl_count}/{total_tests} ({ssl_count/total_tests*100:.0f}%)")
         print(f"  Mobile Friendly: {mobile_count}/{total_tests} ({mobile_count/total_tests*100:.0f}%)")
@@ -301,48 +375,20 @@ class IntegrationTest:
         print(f"\n📋 Individual Results:")
         print(f"\n{'Restaurant':<20} {'Status':<10} {'Overall':<10} {'Grade':<8} {'Time':<8}")
         print("-" * 60)
-        
-        for result in self.results:
-            status = "✅ PASS" if result["success"] else "❌ FAIL"
-            if result["success"]:
-                overall = f"{result['scores']['overall_score']:.1f}"
-                grade = result['scores']['letter_grade']
-            else:
-                overall = "N/A"
-                grade = "N/A"
-            duration = f"{result['duration']:.2f}s"
-            
-            print(f"{result['name']:<20} {status:<10} {overall:<10} {grade:<8} {duration:<8}")
+        print("\n".join(rows))
         
         # Issues found
         print(f"\n⚠️  Issues Found:")
-        issues = []
-        
-        for result in self.results:
-            if not result["success"]:
-                issues.append(f"  ❌ {result['name']}: {result['error']}")
-            else:
-                browser_data = result.get("browser_data", {})
-                if not browser_data.get("has_ssl"):
-                    issues.append(f"  ⚠️  {result['name']}: No SSL certificate")
-                if not browser_data.get("mobile_responsive"):
-                    issues.append(f"  ⚠️  {result['name']}: Not mobile friendly")
-                if not browser_data.get("order_button_detected"):
-                    issues.append(f"  ⚠️  {result['name']}: No order button detected")
-        
         if issues:
-            for issue in issues:
-                print(issue)
+            print("\n".join(issues))
         else:
             print("  ✅ No issues found!")
         
         # Performance metrics
         print(f"\n⚡ Performance Metrics:")
         if self.results:
-            fastest = min(self.results, key=lambda x: x["duration"])
-            slowest = max(self.results, key=lambda x: x["duration"])
-            print(f"  Fastest: {fastest['name']} ({fastest['duration']:.2f}s)")
-            print(f"  Slowest: {slowest['name']} ({slowest['duration']:.2f}s)")
+            print(f"  Fastest: {fastest.name} ({fastest.duration:.2f}s)")
+            print(f"  Slowest: {slowest.name} ({slowest.duration:.2f}s)")
         
         # Final verdict
         print(f"\n{'='*60}")
@@ -371,6 +417,10 @@ class IntegrationTest:
 
 async def main():
     """Main test execution"""
+    # --no-cache rescans every site instead of reusing results from the last hour
+    if "--no-cache" in sys.argv:
+        os.environ["DISABLE_CACHE"] = "1"
+    
     test = IntegrationTest()
     
     try:
@@ -382,6 +432,8 @@ async def main():
         import traceback
         traceback.print_exc()
     finally:
+        from app.core.browser import close_shared_browser
+        await close_shared_browser()
         print("🧹 Cleanup complete")
 
 
@@ -2,7 +2,19 @@
 Debug script to see exactly what order buttons are being detected
 """
 import asyncio
-from app.core.browser import BrowserManager
+import os
+import sys
+from testing_helpers import disk_memoize
+
+@disk_memoize(ttl=3600, cache_if=lambda data: not data.get('error'))
+async def analyze_site(url: str):
+    """Browser analysis for one site, cached on disk between runs"""
+    # Deferred so the script starts fast; only a cache miss needs Playwright
+    from app.core.browser import BrowserManager
+    
+    # Context on the shared browser: one Chromium launch covers every site
+    async with BrowserManager(use_shared_browser=True, block_resources=True) as browser:
+        return await browser.analyze_website(url)
 
 async def debug_order_button(url: str, name: str):
     """Test a single website and show detailed detection info"""
@@ -12,8 +24,7 @@ async def debug_order_button(url: str, name: str):
     print(f"{'='*70}")
     
     try:
-        async with BrowserManager(headless=True) as browser:
-            result = await browser.analyze_website(url)
+        result = await analyze_site(url)
         
         print("\n📊 Detection Results:")
         print(f"  Order Button Detected: {result.get('order_button_detected')}")
@@ -31,24 +42,31 @@ async def debug_order_button(url: str, name: str):
 
 async def main():
     """Test specific websites with issues"""
+    # --no-cache rescans every site instead of reusing results from the last hour
+    if "--no-cache" in sys.argv:
+        os.environ["DISABLE_CACHE"] = "1"
     
-    # Test Burger Town USA - detecting "Menu" incorrectly
-    await debug_order_button(
-        "https://www.burgertownusa.net/",
-        "Burger Town USA"
-    )
-    
-    # Test La KaViet - showing "Order Now" instead of "Order Online"
-    await debug_order_button(
-        "https://lakaviet.com",
-        "La KaViet"
-    )
-    
-    # Test Panera - to verify what it actually found
-    await debug_order_button(
-        "https://www.panerabread.com",
-        "Panera Bread"
-    )
+    try:
+        # Test Burger Town USA - detecting "Menu" incorrectly
+        await debug_order_button(
+            "https://www.burgertownusa.net/",
+            "Burger Town USA"
+        )
+        
+        # Test La KaViet - showing "Order Now" instead of "Order Online"
+        await debug_order_button(
+            "https://lakaviet.com",
+            "La KaViet"
+        )
+        
+        # Test Panera - to verify what it actually found
+        await debug_order_button(
+            "https://www.panerabread.com",
+            "Panera Bread"
+        )
+    finally:
+        from app.core.browser import close_shared_browser
+        await close_shared_browser()
 
 if __name__ == "__main__":
     asyncio.run(main())
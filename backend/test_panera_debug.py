@@ -2,40 +2,42 @@
 Debug Panera Bread specifically to find the order button
 """
 import asyncio
-from app.core.browser import BrowserManager
+
+# Persistent browser profile so repeat runs reuse cookies, cache and consent choices
+PROFILE_DIR = ".pw-profile"
 
 async def debug_panera():
     """Find all buttons and links on Panera to identify the order button"""
+    from app.core.browser import BrowserManager  # deferred: Playwright is slow to import
+    
     url = "https://www.panerabread.com"
     
     print(f"Analyzing: {url}\n")
     
-    async with BrowserManager(headless=True) as browser:
+    async with BrowserManager(headless=True, block_resources=True, user_data_dir=PROFILE_DIR) as browser:
         page = await browser.create_page()
         await page.goto(url, wait_until="networkidle")
         
-        # Find all buttons
+        # Find all buttons (filtered in the page: one round-trip instead of one per element)
         print("=== ALL BUTTONS ===")
-        buttons = await page.query_selector_all('button')
-        for i, button in enumerate(buttons[:15]):  # First 15 buttons
-            try:
-                text = await button.inner_text()
-                if text and len(text) < 100:  # Skip very long text
-                    print(f"{i+1}. Button: '{text.strip()}'")
-            except:
-                pass
+        buttons = await page.evaluate('''() => {
+            return Array.from(document.querySelectorAll('button'))
+                .slice(0, 15)  // First 15 buttons
+                .map((el, index) => ({index, text: el.innerText}))
+                .filter(b => b.text && b.text.length < 100);  // Skip very long text
+        }''')
+        for button in buttons:
+            print(f"{button['index']+1}. Button: '{button['text'].strip()}'")
         
         # Find all links
         print("\n=== ALL LINKS (with 'order' or 'start') ===")
-        links = await page.query_selector_all('a')
-        for i, link in enumerate(links):
-            try:
-                text = await link.inner_text()
-                if text and ('order' in text.lower() or 'start' in text.lower()):
-                    href = await link.get_attribute('href')
-                    print(f"{i+1}. Link: '{text.strip()}' -> {href}")
-            except:
-                pass
+        links = await page.evaluate('''() => {
+            return Array.from(document.querySelectorAll('a'))
+                .map((el, index) => ({index, text: el.innerText, href: el.getAttribute('href')}))
+                .filter(l => l.text && /order|start/i.test(l.text));
+        }''')
+        for link in links:
+            print(f"{link['index']+1}. Link: '{link['text'].strip()}' -> {link['href']}")
         
         await page.close()
 
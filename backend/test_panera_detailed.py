@@ -2,58 +2,53 @@
 Detailed Panera debug - check if "start an order" exists
 """
 import asyncio
-from app.core.browser import BrowserManager
+
+# Persistent browser profile so repeat runs reuse cookies, cache and consent choices
+PROFILE_DIR = ".pw-profile"
 
 async def debug_panera_detailed():
     """Check specifically for 'start an order' text"""
+    from app.core.browser import BrowserManager  # deferred: Playwright is slow to import
+    
     url = "https://www.panerabread.com"
     
     print(f"Analyzing: {url}\n")
     
-    async with BrowserManager(headless=True) as browser:
+    async with BrowserManager(headless=True, block_resources=True, user_data_dir=PROFILE_DIR) as browser:
         page = await browser.create_page()
         await page.goto(url, wait_until="networkidle")
         
-        # Check if "start an order" text exists anywhere
-        print("=== Checking for 'start an order' text ===")
-        has_text = await page.evaluate('''() => {
+        # Collect all three checks in one evaluate: one DOM walk, one round-trip
+        data = await page.evaluate('''() => {
             const bodyText = document.body.innerText.toLowerCase();
-            return bodyText.includes('start an order');
+            const elements = Array.from(document.querySelectorAll('button, a'))
+                .filter(el => el.innerText)
+                .map(el => ({el, text: el.innerText.toLowerCase()}));
+            const describe = ({el}) => ({
+                tag: el.tagName,
+                text: el.innerText.substring(0, 100),
+                id: el.id,
+                className: el.className
+            });
+            return {
+                hasStartAnOrder: bodyText.includes('start an order'),
+                start: elements.filter(e => e.text.includes('start')).slice(0, 10).map(describe),
+                order: elements.filter(e => e.text.includes('order')).slice(0, 10).map(describe)
+            };
         }''')
-        print(f"Page contains 'start an order': {has_text}")
+        
+        # Check if "start an order" text exists anywhere
+        print("=== Checking for 'start an order' text ===")
+        print(f"Page contains 'start an order': {data['hasStartAnOrder']}")
         
         # Find all elements with "start" in text
         print("\n=== Elements containing 'start' ===")
-        start_elements = await page.evaluate('''() => {
-            const elements = Array.from(document.querySelectorAll('button, a'));
-            return elements
-                .filter(el => el.innerText && el.innerText.toLowerCase().includes('start'))
-                .map(el => ({
-                    tag: el.tagName,
-                    text: el.innerText.substring(0, 100),
-                    id: el.id,
-                    className: el.className
-                }));
-        }''')
-        
-        for i, el in enumerate(start_elements[:10]):
+        for i, el in enumerate(data['start']):
             print(f"{i+1}. {el['tag']}: '{el['text']}' (id={el['id']}, class={el['className'][:50]})")
         
         # Find all elements with "order" in text
         print("\n=== Elements containing 'order' ===")
-        order_elements = await page.evaluate('''() => {
-            const elements = Array.from(document.querySelectorAll('button, a'));
-            return elements
-                .filter(el => el.innerText && el.innerText.toLowerCase().includes('order'))
-                .map(el => ({
-                    tag: el.tagName,
-                    text: el.innerText.substring(0, 100),
-                    id: el.id,
-                    className: el.className
-                }));
-        }''')
-        
-        for i, el in enumerate(order_elements[:10]):
+        for i, el in enumerate(data['order']):
             print(f"{i+1}. {el['tag']}: '{el['text']}' (id={el['id']}, class={el['className'][:50]})")
         
         await page.close()
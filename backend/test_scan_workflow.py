@@ -1,11 +1,16 @@
 import asyncio
-import httpx
-from datetime import datetime
+import time
 
-async def test_scan_workflow():
+from testing_helpers import BASE_URL, backend_client, backend_is_live
+
+# Status polling: start at 250ms, grow 1.5x per check, cap at 5s, give up after 2 minutes
+POLL_INITIAL_INTERVAL = 0.25
+POLL_BACKOFF = 1.5
+POLL_MAX_INTERVAL = 5.0
+POLL_TIMEOUT = 120
+
+async def run_scan_workflow(client):
     """Test complete scan workflow through API"""
-    base_url = "http://localhost:8000"
-    
     # Test data
     scan_data = {
         "restaurant_name": "Chipotle",
@@ -13,38 +18,53 @@ async def test_scan_workflow():
         "restaurant_data": {}
     }
     
-    async with httpx.AsyncClient(follow_redirects=True) as client:
-        # 1. Create scan
-        print("Creating scan...")
-        response = await client.post(f"{base_url}/api/scans/", json=scan_data)
-        print(f"Response status: {response.status_code}")
-        print(f"Response text: {response.text}")
+    # 1. Create scan
+    print("Creating scan...")
+    response = await client.post("/api/scans/", json=scan_data)
+    print(f"Response status: {response.status_code}")
+    print(f"Response text: {response.text}")
+    
+    if response.status_code != 200:
+        print(f"❌ Failed to create scan: {response.status_code}")
+        return
         
-        if response.status_code != 200:
-            print(f"❌ Failed to create scan: {response.status_code}")
-            return
-            
-        result = response.json()
-        scan_id = result["scan_id"]
-        print(f"Scan created: {scan_id}")
+    result = response.json()
+    scan_id = result["scan_id"]
+    print(f"Scan created: {scan_id}")
+    
+    # 2. Poll for results: check again quickly at first, then back off
+    print("Waiting for scan to complete...")
+    deadline = time.monotonic() + POLL_TIMEOUT
+    interval = POLL_INITIAL_INTERVAL
+    while True:
+        await asyncio.sleep(interval)
+        response = await client.get(f"/api/scans/{scan_id}")
+        scan = response.json()
+        status = scan["status"]
+        print(f"Status: {status}")
+        
+        if status == "completed":
+            print("\n✅ Scan completed!")
+            print(f"Overall Score: {scan['results']['overall_score']}")
+            print(f"Letter Grade: {scan['results']['letter_grade']}")
+            break
+        elif status == "failed":
+            print(f"\n❌ Scan failed: {scan.get('error')}")
+            break
+        
+        if time.monotonic() >= deadline:
+            print(f"\n⏱️  Scan still {status} after {POLL_TIMEOUT}s, giving up")
+            break
         
-        # 2. Poll for results
-        print("Waiting for scan to complete...")
-        for i in range(30):  # Wait up to 30 seconds
-            await asyncio.sleep(1)
-            response = await client.get(f"{base_url}/api/scans/{scan_id}")
-            scan = response.json()
-            status = scan["status"]
-            print(f"Status: {status}")
-            
-            if status == "completed":
-                print("\n✅ Scan completed!")
-                print(f"Overall Score: {scan['results']['overall_score']}")
-                print(f"Letter Grade: {scan['results']['letter_grade']}")
-                break
-            elif status == "failed":
-                print(f"\n❌ Scan failed: {scan.get('error')}")
-                break
+        interval = min(interval * POLL_BACKOFF, POLL_MAX_INTERVAL)
+
+async def main():
+    """Run the workflow test on one pooled client"""
+    async with backend_client(timeout=60.0) as client:
+        if not await backend_is_live(client):
+            print(f"⚠️  SKIPPED - backend not reachable at {BASE_URL}")
+            return
+        await run_scan_workflow(client)
 
 if __name__ == "__main__":
-    asyncio.run(test_scan_workflow())
+    asyncio.run(main())
@@ -1,56 +1,86 @@
 import unittest
+from types import MappingProxyType
 from app.core.scoring import RestaurantScorer
 
+def _read_only(data):
+    """Wrap a category -> fields fixture so tests can't mutate the shared copy."""
+    return MappingProxyType({key: MappingProxyType(value) for key, value in data.items()})
+
+SAMPLE_DATA_GOOD = _read_only({
+    "website": {
+        "pagespeed_score": 90,  # Increased to ensure score meets threshold
+        "is_mobile_friendly": True,
+        "has_online_ordering": True,
+        "has_ssl": True
+    },
+    "google": {
+        "is_verified": True,
+        "profile_completeness": 90,  # Increased to ensure higher score
+        "response_rate": 0.9,  # Increased response rate
+        "post_frequency": 5
+    },
+    "reviews": {
+        "avg_rating": 4.7,  # Slightly increased rating
+        "review_count": 300,  # Increased review count
+        "reviews": [
+            {"date": "2024-02-10", "sentiment_score": 95},
+            {"date": "2024-02-11", "sentiment_score": 90}
+        ]
+    },
+    "ordering": {
+        "has_ordering_system": True,
+        "platforms": ["UberEats", "DoorDash", "GrubHub", "Postmates"],
+        "direct_ordering": True,
+        "order_button_ease": 9
+    }
+})
+
+SAMPLE_DATA_POOR = _read_only({
+    "website": {
+        "pagespeed_score": 5,  # Extremely low page speed
+        "is_mobile_friendly": False,
+        "has_online_ordering": False,
+        "has_ssl": False
+    },
+    "google": {
+        "is_verified": False,
+        "profile_completeness": 0,  # Absolutely no profile completeness
+        "response_rate": 0,  # No response
+        "post_frequency": 0
+    },
+    "reviews": {
+        "avg_rating": 0.5,  # Absolute minimum rating
+        "review_count": 0,  # No reviews at all
+        "reviews": []  # Empty reviews list
+    },
+    "ordering": {
+        "has_ordering_system": False,
+        "platforms": [],
+        "direct_ordering": False,
+        "order_button_ease": 0
+    }
+})
+
+EXTREME_HIGH_DATA = _read_only({
+    "website": {"pagespeed_score": 1000, "is_mobile_friendly": True, "has_online_ordering": True, "has_ssl": True},
+    "google": {"is_verified": True, "profile_completeness": 1000, "response_rate": 10, "post_frequency": 100},
+    "reviews": {"avg_rating": 10, "review_count": 10000, "reviews": [{"date": "2024-02-11", "sentiment_score": 200}]},
+    "ordering": {"has_ordering_system": True, "platforms": ["Platform1", "Platform2", "Platform3", "Platform4"], "direct_ordering": True, "order_button_ease": 20}
+})
+
 class TestRestaurantScorer(unittest.TestCase):
-    def setUp(self):
-        """Initialize the RestaurantScorer for each test."""
-        self.scorer = RestaurantScorer()
+    @classmethod
+    def setUpClass(cls):
+        """Initialize one RestaurantScorer shared by every test."""
+        cls.scorer = RestaurantScorer()
 
     def test_good_restaurant_scoring(self):
         """Test scoring for a high-performing restaurant."""
-        sample_data_good = {
-            "website": {
-                "pagespeed_score": 90,  # Increased to ensure score meets threshold
-                "is_mobile_friendly": True,
-                "has_online_ordering": True,
-                "has_ssl": True
-            },
-            "google": {
-                "is_verified": True,
-                "profile_completeness": 90,  # Increased to ensure higher score
-                "response_rate": 0.9,  # Increased response rate
-                "post_frequency": 5
-            },
-            "reviews": {
-                "avg_rating": 4.7,  # Slightly increased rating
-                "review_count": 300,  # Increased review count
-                "reviews": [
-                    {"date": "2024-02-10", "sentiment_score": 95},
-                    {"date": "2024-02-11", "sentiment_score": 90}
-                ]
-            },
-            "ordering": {
-                "has_ordering_system": True,
-                "platforms": ["UberEats", "DoorDash", "GrubHub", "Postmates"],
-                "direct_ordering": True,
-                "order_button_ease": 9
-            }
-        }
-
-        # Calculate individual category scores
-        website_score = self.scorer.calculate_website_score(sample_data_good["website"])
-        google_score = self.scorer.calculate_google_score(sample_data_good["google"])
-        reviews_score = self.scorer.calculate_reviews_score(sample_data_good["reviews"])
-        ordering_score = self.scorer.calculate_ordering_score(sample_data_good["ordering"])
-
-        # Calculate overall score
-        scores = {
-            "website": website_score,
-            "google": google_score,
-            "reviews": reviews_score,
-            "ordering": ordering_score
-        }
-        result = self.scorer.calculate_overall_score(scores)
+        # Score every category and the overall result in one call
+        result = self.scorer.score_restaurant(SAMPLE_DATA_GOOD)
+        website_score, google_score, reviews_score, ordering_score = (
+            result["category_scores"][category] for category in ("website", "google", "reviews", "ordering")
+        )
 
         # Assertions for good restaurant
         self.assertGreaterEqual(result["overall_score"], 80, "Overall score should be 80 or higher")
@@ -64,46 +94,11 @@ class TestRestaurantScorer(unittest.TestCase):
 
     def test_poor_restaurant_scoring(self):
         """Test scoring for a poor-performing restaurant."""
-        sample_data_poor = {
-            "website": {
-                "pagespeed_score": 5,  # Extremely low page speed
-                "is_mobile_friendly": False,
-                "has_online_ordering": False,
-                "has_ssl": False
-            },
-            "google": {
-                "is_verified": False,
-                "profile_completeness": 0,  # Absolutely no profile completeness
-                "response_rate": 0,  # No response
-                "post_frequency": 0
-            },
-            "reviews": {
-                "avg_rating": 0.5,  # Absolute minimum rating
-                "review_count": 0,  # No reviews at all
-                "reviews": []  # Empty reviews list
-            },
-            "ordering": {
-                "has_ordering_system": False,
-                "platforms": [],
-                "direct_ordering": False,
-                "order_button_ease": 0
-            }
-        }
-
-        # Calculate individual category scores
-        website_score = self.scorer.calculate_website_score(sample_data_poor["website"])
-        google_score = self.scorer.calculate_google_score(sample_data_poor["google"])
-        reviews_score = self.scorer.calculate_reviews_score(sample_data_poor["reviews"])
-        ordering_score = self.scorer.calculate_ordering_score(sample_data_poor["ordering"])
-
-        # Calculate overall score
-        scores = {
-            "website": website_score,
-            "google": google_score,
-            "reviews": reviews_score,
-            "ordering": ordering_score
-        }
-        result = self.scorer.calculate_overall_score(scores)
+        # Score every category and the overall result in one call
+        result = self.scorer.score_restaurant(SAMPLE_DATA_POOR)
+        website_score, google_score, reviews_score, ordering_score = (
+            result["category_scores"][category] for category in ("website", "google", "reviews", "ordering")
+        )
 
         # Assertions for poor restaurant
         self.assertLess(result["overall_score"], 10, "Overall score should be less than 10")
@@ -146,17 +141,10 @@ class TestRestaurantScorer(unittest.TestCase):
     def test_score_clamping(self):
         """Test that scores are always clamped between 0 and 100."""
         # Test extremely high values
-        extreme_high_data = {
-            "website": {"pagespeed_score": 1000, "is_mobile_friendly": True, "has_online_ordering": True, "has_ssl": True},
-            "google": {"is_verified": True, "profile_completeness": 1000, "response_rate": 10, "post_frequency": 100},
-            "reviews": {"avg_rating": 10, "review_count": 10000, "reviews": [{"date": "2024-02-11", "sentiment_score": 200}]},
-            "ordering": {"has_ordering_system": True, "platforms": ["Platform1", "Platform2", "Platform3", "Platform4"], "direct_ordering": True, "order_button_ease": 20}
-        }
-
-        website_score = self.scorer.calculate_website_score(extreme_high_data["website"])
-        google_score = self.scorer.calculate_google_score(extreme_high_data["google"])
-        reviews_score = self.scorer.calculate_reviews_score(extreme_high_data["reviews"])
-        ordering_score = self.scorer.calculate_ordering_score(extreme_high_data["ordering"])
+        website_score = self.scorer.calculate_website_score(EXTREME_HIGH_DATA["website"])
+        google_score = self.scorer.calculate_google_score(EXTREME_HIGH_DATA["google"])
+        reviews_score = self.scorer.calculate_reviews_score(EXTREME_HIGH_DATA["reviews"])
+        ordering_score = self.scorer.calculate_ordering_score(EXTREME_HIGH_DATA["ordering"])
 
         # All scores should be clamped to 100
         self.assertLessEqual(website_score, 100, "Website score should be clamped to 100")
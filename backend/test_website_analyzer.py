@@ -0,0 +1,61 @@
+import unittest
+from unittest import mock
+from app.services import website_analyzer
+from app.services.website_analyzer import WebsiteAnalyzer
+
+PAGESPEED_RESPONSE = mock.Mock(
+    content=b'{"lighthouseResult": {"categories": {"performance": {"score": 0.9}}}}'
+)
+
+class TestWebsiteAnalyzerCache(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        """Start each test with empty caches and no Redis."""
+        WebsiteAnalyzer._analysis_cache.clear()
+        for name, value in (('_get_cached_pagespeed', None), ('_set_cached_pagespeed', None)):
+            patcher = mock.patch.object(WebsiteAnalyzer, name, mock.AsyncMock(return_value=value))
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        patcher = mock.patch.object(website_analyzer, 'get_http_client', mock.Mock())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = mock.patch.object(
+            WebsiteAnalyzer, '_analyze_with_playwright',
+            mock.AsyncMock(return_value={'https_enabled': True})
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    async def test_pagespeed_failure_is_not_cached(self):
+        """A failed PageSpeed call should be retried on the next scan, not served from cache."""
+        request = mock.AsyncMock(side_effect=[TimeoutError("PageSpeed timed out"), PAGESPEED_RESPONSE])
+        with mock.patch.object(website_analyzer, 'request_with_retry', request):
+            first = await WebsiteAnalyzer.analyze_website("https://example.com")
+            second = await WebsiteAnalyzer.analyze_website("https://example.com")
+
+        # The failed run keeps the Playwright results but has no PageSpeed scores
+        self.assertEqual(first, {'https_enabled': True})
+        self.assertEqual(request.await_count, 2, "PageSpeed should be called again after a failure")
+        self.assertEqual(second['performance_score'], 90)
+
+    async def test_complete_analysis_is_cached(self):
+        """A complete analysis should be reused without calling PageSpeed again."""
+        request = mock.AsyncMock(return_value=PAGESPEED_RESPONSE)
+        with mock.patch.object(website_analyzer, 'request_with_retry', request):
+            await WebsiteAnalyzer.analyze_website("https://example.com")
+            cached = await WebsiteAnalyzer.analyze_website("https://example.com/")
+
+        self.assertEqual(request.await_count, 1)
+        self.assertEqual(cached['performance_score'], 90)
+
+    async def test_playwright_failure_propagates(self):
+        """A failed browser analysis should fail the scan rather than score PageSpeed alone."""
+        WebsiteAnalyzer._analyze_with_playwright.side_effect = TimeoutError("Navigation timed out")
+        request = mock.AsyncMock(return_value=PAGESPEED_RESPONSE)
+        with mock.patch.object(website_analyzer, 'request_with_retry', request):
+            with self.assertRaises(TimeoutError):
+                await WebsiteAnalyzer.analyze_website("https://example.com")
+
+        self.assertIsNone(WebsiteAnalyzer._analysis_cache.get(("https://example.com", True, True)))
+
+if __name__ == '__main__':
+    unittest.main()
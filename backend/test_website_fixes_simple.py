@@ -8,111 +8,113 @@ Tests:
 """
 
 import asyncio
-import httpx
 import json
+import time
 from datetime import datetime
 
-BASE_URL = "http://localhost:8000"
+from testing_helpers import (
+    ANALYSIS_TIMEOUT, BASE_URL, OFFLINE, VERBOSE,
+    backend_client, backend_is_live, validation_client
+)
 
-async def test_case(name, url, expected_status, description):
+SEP = "=" * 60
+
+# (name, url, expected_status, description)
+CASES = [
+    ("Invalid URL Format", "not-a-url", 422, "Should return 422 for invalid URL format"),
+    ("Invalid Protocol", "ftp://invalid-protocol.com", 422, "Should return 422 for non-http/https protocol"),
+    ("Non-existent Domain", "https://thisdoesnotexist12345xyz.com", 422, "Should return 422 for unreachable domain"),
+    ("Valid Site (Chipotle)", "https://chipotle.com", 200, "Should complete successfully with analysis data"),
+    ("Valid Site (Example.com)", "https://example.com", 200, "Should complete successfully with analysis data"),
+]
+
+# Valid sites make the backend drive a browser; limit how many it renders at once
+BROWSER_SEMAPHORE = asyncio.Semaphore(3)
+
+async def run_case(client, name, url, expected_status, description):
     """Run a single test case"""
-    print(f"\n{'='*60}")
-    print(f"TEST: {name}")
-    print(f"{'='*60}")
-    print(f"URL: {url}")
-    print(f"Expected Status: {expected_status}")
-    print(f"Description: {description}")
-    print()
+    start = time.perf_counter()
+    payload = None
+    try:
+        if expected_status == 200:
+            async with BROWSER_SEMAPHORE:
+                response = await client.post(
+                    "/api/website/analyze",
+                    json={"url": url},
+                    timeout=ANALYSIS_TIMEOUT
+                )
+        else:
+            response = await client.post("/api/website/analyze", json={"url": url})
+        # Decode once; non-JSON bodies (e.g. a proxy error page) are kept as text
+        try:
+            payload = response.json()
+        except ValueError:
+            payload = response.text
+    except Exception as e:
+        response = e
+    elapsed = time.perf_counter() - start
     
-    start_time = datetime.now()
+    # Print the whole case at once so concurrent cases don't interleave
+    print(
+        f"\n{SEP}\nTEST: {name}\n{SEP}\n"
+        f"URL: {url}\nExpected Status: {expected_status}\nDescription: {description}\n"
+    )
     
-    async with httpx.AsyncClient(timeout=60.0) as client:
-        try:
-            response = await client.post(
-                f"{BASE_URL}/api/website/analyze",
-                json={"url": url}
-            )
-            
-            elapsed = (datetime.now() - start_time).total_seconds()
-            print(f"Completed in {elapsed:.1f} seconds")
-            print(f"Status Code: {response.status_code}")
+    try:
+        if isinstance(response, Exception):
+            raise response
+        print(f"Completed in {elapsed:.1f} seconds")
+        print(f"Status Code: {response.status_code}")
+        
+        if response.status_code == expected_status:
+            print(f"✅ PASS - Got expected status {expected_status}")
             
-            if response.status_code == expected_status:
-                print(f"✅ PASS - Got expected status {expected_status}")
-                
-                if response.status_code == 200:
-                    data = response.json()
+            if response.status_code == 200:
+                data = payload
+                if VERBOSE:
                     print(f"   Website Score: {data.get('website_score', 0):.1f}")
                     print(f"   Status: {data.get('status')}")
                     print(f"   Recommendations: {len(data.get('recommendations', []))}")
-                    analysis_data = data.get('analysis_data', {})
-                    if analysis_data and len(analysis_data) > 0:
+                analysis_data = data.get('analysis_data', {})
+                if analysis_data and len(analysis_data) > 0:
+                    if VERBOSE:
                         print(f"   Analysis Data Keys: {list(analysis_data.keys())}")
-                    else:
-                        print("   ⚠️  WARNING: Analysis data is empty")
                 else:
-                    print(f"   Error: {response.json().get('detail', 'No detail')}")
-            else:
-                print(f"❌ FAIL - Expected {expected_status}, got {response.status_code}")
-                print(f"   Response: {json.dumps(response.json(), indent=2)}")
-                
-        except Exception as e:
-            print(f"❌ ERROR: {e}")
-    
-    # Wait a bit between tests to avoid browser conflicts
-    await asyncio.sleep(2)
+                    print("   ⚠️  WARNING: Analysis data is empty")
+            elif VERBOSE:
+                print(f"   Error: {payload.get('detail', 'No detail')}")
+        else:
+            print(f"❌ FAIL - Expected {expected_status}, got {response.status_code}")
+            print(f"   Response: {json.dumps(payload, indent=2)}")
+            
+    except Exception as e:
+        print(f"❌ ERROR: {e}")
 
 async def main():
-    """Run all tests sequentially"""
-    print("\n" + "="*60)
+    """Run all tests concurrently"""
+    print("\n" + SEP)
     print("WEBSITE-ONLY ANALYSIS FIXES - SIMPLE TEST SUITE")
-    print("="*60)
+    print(SEP)
     print(f"Testing against: {BASE_URL}")
     print(f"Started at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     
-    # Test 1: Invalid URL format
-    await test_case(
-        "Invalid URL Format",
-        "not-a-url",
-        422,
-        "Should return 422 for invalid URL format"
-    )
-    
-    # Test 2: Invalid protocol
-    await test_case(
-        "Invalid Protocol",
-        "ftp://invalid-protocol.com",
-        422,
-        "Should return 422 for non-http/https protocol"
-    )
-    
-    # Test 3: Non-existent domain
-    await test_case(
-        "Non-existent Domain",
-        "https://thisdoesnotexist12345xyz.com",
-        422,
-        "Should return 422 for unreachable domain"
-    )
-    
-    # Test 4: Valid site
-    await test_case(
-        "Valid Site (Chipotle)",
-        "https://chipotle.com",
-        200,
-        "Should complete successfully with analysis data"
-    )
-    
-    # Test 5: Another valid site
-    await test_case(
-        "Valid Site (Example.com)",
-        "https://example.com",
-        200,
-        "Should complete successfully with analysis data"
-    )
+    # One pooled client for every test, so connections are reused
+    async with backend_client() as client, validation_client(client) as local_client:
+        live = await backend_is_live(client)
+        if not live:
+            print(f"\n⚠️  Backend not reachable at {BASE_URL} - skipping tests that need it")
+        
+        # The cases are independent; run them together, each prints its own block.
+        # Only browser-driven cases (expected 200) need the live server when OFFLINE is set
+        await asyncio.gather(*(
+            run_case(client if expected_status == 200 else local_client, name, url, expected_status, description)
+            for name, url, expected_status, description in CASES
+            if live or (OFFLINE and expected_status != 200)
+        ))
     
-    print("\n" + "="*60)
+    print("\n" + SEP)
     print("TEST SUITE COMPLETED")
-    print("="*60)
+    print(SEP)
     print(f"Finished at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     print("\nNOTE: Panera.com was excluded from tests as it legitimately")
     print("times out even with 30s timeout, which is expected behavior.")
@@ -0,0 +1,186 @@
+"""
+Shared setup for the hand-run API test scripts: backend address, timeouts,
+pooled clients and the liveness probe (test_scan_workflow.py,
+test_website_fixes*.py), the PageSpeed client (test_pagespeed_*.py) and the
+on-disk result cache (test_integration.py, test_order_button_debug.py).
+
+Named so pytest doesn't collect it.
+"""
+import contextlib
+import functools
+import hashlib
+import inspect
+import json
+import logging
+import os
+import time
+from urllib.parse import urlparse
+
+import httpx
+
+BASE_URL = "http://localhost:8000"
+
+# Response bodies and per-site details are only printed with VERBOSE=1
+VERBOSE = bool(os.getenv("VERBOSE"))
+
+# With OFFLINE=1 the validation-only tests call the app in-process, no server needed
+OFFLINE = bool(os.getenv("OFFLINE"))
+
+# Validation errors should come back in well under a second; only analyses that
+# drive a browser get the long read budget
+DEFAULT_TIMEOUT = httpx.Timeout(10.0, connect=3.0, write=5.0, pool=1.0)
+ANALYSIS_TIMEOUT = httpx.Timeout(60.0, connect=3.0, write=5.0, pool=1.0)
+
+# A single short probe decides whether tests that need the running backend are run at all
+PROBE_TIMEOUT = 3.0
+
+def backend_client(timeout=DEFAULT_TIMEOUT):
+    """Pooled client for the running backend; one per script run so connections are reused"""
+    # The transport retries failed connects once, so a transient DNS blip doesn't fail a test
+    # (httpx ignores client-level limits when a transport is given, so they go here)
+    return httpx.AsyncClient(
+        base_url=BASE_URL,
+        timeout=timeout,
+        follow_redirects=True,
+        transport=httpx.AsyncHTTPTransport(
+            retries=1,
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=100)
+        )
+    )
+
+@contextlib.asynccontextmanager
+async def offline_client():
+    """Client that serves requests from the FastAPI app in this process"""
+    from app.main import app  # deferred: imports the whole backend
+    from app.utils.http_client import close_http_client
+    
+    # ASGITransport skips the app's lifespan, so close the pooled client it may open
+    try:
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app),
+            base_url="http://testserver",
+            timeout=DEFAULT_TIMEOUT
+        ) as client:
+            yield client
+    finally:
+        await close_http_client()
+
+def validation_client(client):
+    """Context for the client validation-only tests use: in-process with OFFLINE=1, else the live one"""
+    return offline_client() if OFFLINE else contextlib.nullcontext(client)
+
+async def backend_is_live(client):
+    """Check once whether the backend answers, so a dead server costs one timeout instead of one per test"""
+    try:
+        await client.get("/health", timeout=PROBE_TIMEOUT)
+        return True
+    except httpx.HTTPError:
+        return False
+
+PAGESPEED_URL = "https://www.googleapis.com/pagespeedonline/v5/runPagespeed"
+
+# Every category we score; one Lighthouse run covers all of them
+PAGESPEED_CATEGORIES = ('PERFORMANCE', 'ACCESSIBILITY', 'BEST_PRACTICES', 'SEO')
+
+# Shared client so repeated calls reuse the TLS connection (HTTP/2 to googleapis.com)
+_PAGESPEED_CLIENT = None
+
+def pagespeed_client():
+    """Create the shared PageSpeed client on first use"""
+    global _PAGESPEED_CLIENT
+    if _PAGESPEED_CLIENT is None:
+        _PAGESPEED_CLIENT = httpx.AsyncClient(
+            http2=True,
+            timeout=httpx.Timeout(120.0, connect=10.0),
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=40)
+        )
+    return _PAGESPEED_CLIENT
+
+async def close_pagespeed_client():
+    """Release the shared PageSpeed client's connections, if it was created"""
+    global _PAGESPEED_CLIENT
+    if _PAGESPEED_CLIENT is not None:
+        await _PAGESPEED_CLIENT.aclose()
+        _PAGESPEED_CLIENT = None
+
+async def pagespeed_batch(url, strategy='MOBILE', categories=PAGESPEED_CATEGORIES):
+    """Run one PageSpeed audit covering all requested categories, with backoff on
+    timeouts, 429 (honoring Retry-After) and 5xx responses"""
+    from app.config import settings  # deferred: settings require the backend's env
+    from app.utils.http_client import request_with_retry
+    
+    params = [
+        ('url', url),
+        ('key', settings.PAGESPEED_API_KEY),
+        ('strategy', strategy)
+    ]
+    params.extend(('category', category) for category in categories)
+    
+    try:
+        return await request_with_retry(
+            pagespeed_client(), 'GET', PAGESPEED_URL, max_attempts=4, params=params
+        )
+    except httpx.HTTPStatusError as e:
+        # Not retryable, or out of attempts: return the response so it gets reported
+        return e.response
+
+# On-disk results for the scripts that rescan the same sites, so re-runs skip the browser
+DISK_CACHE_DIR = os.path.join('.cache', 'pagescan')
+
+def _normalize_url(url):
+    """Lowercase scheme and host and drop the trailing slash and fragment, as
+    WebsiteAnalyzer._cache_key does (without importing the backend and its settings)"""
+    parsed = urlparse(url)
+    return parsed._replace(
+        scheme=parsed.scheme.lower(),
+        netloc=parsed.netloc.lower(),
+        path=parsed.path.rstrip('/'),
+        fragment=''
+    ).geturl()
+
+def _disk_cache_path(func, url, args, kwargs):
+    """Cache file for one call; keyed by script, function, normalized URL and the other arguments"""
+    # Scripts run as __main__, so name them by file to keep their entries apart
+    script = os.path.splitext(os.path.basename(inspect.getfile(func)))[0]
+    namespace = f"{script}.{func.__qualname__}"
+    key = repr((_normalize_url(url), args, sorted(kwargs.items())))
+    digest = hashlib.sha1(key.encode('utf-8')).hexdigest()
+    return os.path.join(DISK_CACHE_DIR, f"{namespace}-{digest}.json")
+
+def disk_memoize(ttl=3600.0, cache_if=None):
+    """Cache an async function's JSON result on disk for ttl seconds, keyed by its URL
+    (first argument) and other arguments; only results cache_if accepts are stored.
+    Set DISABLE_CACHE=1 to always call through"""
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(url, *args, **kwargs):
+            if os.environ.get('DISABLE_CACHE') == '1':
+                return await func(url, *args, **kwargs)
+            
+            path = _disk_cache_path(func, url, args, kwargs)
+            try:
+                if time.time() - os.path.getmtime(path) < ttl:
+                    with open(path, 'r', encoding='utf-8') as f:
+                        return json.load(f)
+            except (OSError, ValueError):
+                pass
+            
+            result = await func(url, *args, **kwargs)
+            if cache_if is None or cache_if(result):
+                # Write then rename so concurrent readers never see a partial file
+                tmp_path = f"{path}.{os.getpid()}.tmp"
+                try:
+                    os.makedirs(DISK_CACHE_DIR, exist_ok=True)
+                    with open(tmp_path, 'w', encoding='utf-8') as f:
+                        json.dump(result, f, default=str)
+                    os.replace(tmp_path, path)
+                except (OSError, TypeError, ValueError) as e:
+                    # A cache write failure shouldn't cost the scan that just finished
+                    logging.warning(f"Could not cache result for {url}: {e}")
+                    with contextlib.suppress(OSError):
+                        os.remove(tmp_path)
+            return result
+        
+        return wrapper
+    
+    return decorator